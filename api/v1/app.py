@@ -5,9 +5,34 @@ from os import getenv
 from flask import Flask, jsonify, make_response
 from flask_cors import CORS
 from models import storage
+from models.engine import serializer
 from api.v1.views import app_views
+try:
+    from flask.json.provider import DefaultJSONProvider
+except ImportError:
+    # Flask < 2.2 has no JSON providers, keep its own encoder
+    DefaultJSONProvider = None
+
+if DefaultJSONProvider is not None:
+    class JSONProvider(DefaultJSONProvider):
+        """JSON provider using the serializer shared with the storage"""
+
+        def dumps(self, obj, **kwargs):
+            """Serialize obj, indented output is left to Flask"""
+            if "indent" not in kwargs:
+                try:
+                    return serializer.dumps(obj, sort_keys=self.sort_keys)
+                except TypeError:
+                    pass
+            return super().dumps(obj, **kwargs)
+
+        def loads(self, s, **kwargs):
+            """Deserialize the JSON document s"""
+            return serializer.loads(s)
 
 app = Flask(__name__)
+if DefaultJSONProvider is not None:
+    app.json = JSONProvider(app)
 
 # Register app_views with Blueprint
 app.register_blueprint(app_views, url_prefix="/api/v1")
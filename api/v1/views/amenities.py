@@ -3,6 +3,8 @@
 
 from flask import abort, jsonify, request
 from api.v1.views import app_views
+from api.v1.views.conditional import object_response
+from api.v1.views.pagination import paginate
 from models import storage
 from models.amenity import Amenity
 
@@ -13,9 +15,7 @@ from models.amenity import Amenity
     '/amenities', methods=['GET'], strict_slashes=False)
 def amenities():
     """Retrieve all amenities"""
-    _amenities = [
-        amenity.to_dict() for amenity in storage.all(Amenity).values()]
-    return jsonify(_amenities), 200
+    return paginate(Amenity, cached=True)
 
 
 # API ROUTE: '/amenities'       method: GET
@@ -30,7 +30,7 @@ def get_amenity(amenity_id):
     amenity = storage.get(Amenity, amenity_id)
     if not amenity:
         abort(404)
-    return jsonify(amenity.to_dict()), 200
+    return object_response(amenity)
 
 
 # API ROUTE: '/amenities/amenity_id'       method: DELETE
@@ -87,5 +87,5 @@ def update_amenity(amenity_id: str = None):
     for key, value in data.items():
         if key not in ignore_keys:
             setattr(amenity, key, value)
-    storage.save()
+    amenity.save()
     return jsonify(amenity.to_dict()), 200
@@ -5,6 +5,8 @@ from models import storage
 from models.city import City
 from models.state import State
 from api.v1.views import app_views
+from api.v1.views.conditional import object_response
+from api.v1.views.pagination import paginate
 from flask import abort, request, jsonify
 
 
@@ -18,10 +20,7 @@ def get_all_cities(state_id):
     state = storage.get(State, state_id)
     if not state:
         abort(404)
-    cities = [
-        city.to_dict() for city in storage.all(City).values()
-        if city.state_id == state_id]
-    return jsonify(cities), 200
+    return paginate(City, {"state_id": state_id})
 
 
 # API ROUTE: '/cities/<city_id>'       method: GET
@@ -34,7 +33,7 @@ def get_city(city_id):
     city = storage.get(City, city_id)
     if not city:
         abort(404)
-    return jsonify(city.to_dict()), 200
+    return object_response(city)
 
 
 # API ROUTE: '/cities/<city_id>'       method: DELETE
@@ -98,5 +97,5 @@ def update_city(city_id):
     for key, value in data.items():
         if key not in ignore_keys:
             setattr(city, key, value)
-    storage.save()
+    city.save()
     return jsonify(city.to_dict()), 200
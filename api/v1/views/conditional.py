@@ -0,0 +1,63 @@
+#!/usr/bin/python3
+"""
+Conditional request helpers for the GET views
+
+Objects are sent with a strong ETag computed from their id and
+updated_at, collections with one computed from the fingerprint the
+storage keeps for their class and the query of the request. A request
+whose If-None-Match holds the ETag gets an empty 304 response, the
+body is not built.
+"""
+
+from flask import Response, jsonify, request
+from hashlib import blake2b
+from models import storage
+
+
+def etag(*parts):
+    """Return the ETag value of parts, joined by spaces"""
+    value = " ".join(str(part) for part in parts)
+    return blake2b(value.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def not_modified(tag, last_modified=None):
+    """Return the 304 response of tag if the request already holds the
+    current representation, None otherwise
+
+    If-Modified-Since is only checked when last_modified is given and
+    the request has no If-None-Match"""
+    if request.if_none_match:
+        fresh = request.if_none_match.contains(tag)
+    elif last_modified is not None and request.if_modified_since:
+        since = request.if_modified_since.replace(tzinfo=None)
+        fresh = last_modified.replace(microsecond=0) <= since
+    else:
+        fresh = False
+    if not fresh:
+        return None
+    return validated(Response(status=304), tag, last_modified)
+
+
+def validated(response, tag, last_modified=None):
+    """Return response with its ETag and Last-Modified headers set"""
+    response.set_etag(tag)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    return response
+
+
+def object_response(obj):
+    """Return the JSON response of obj, or a 304 response"""
+    tag = etag(obj.__class__.__name__, obj.id, obj.updated_at)
+    response = not_modified(tag, obj.updated_at)
+    if response is None:
+        response = validated(jsonify(storage.to_dict(obj)), tag,
+                             obj.updated_at)
+    return response
+
+
+def collection_tag(cls):
+    """Return the ETag and the latest updated_at of the cls collection
+    answering the request"""
+    count, checksum, updated_at = storage.fingerprint(cls)
+    return etag(cls.__name__, count, checksum, request.full_path), updated_at
@@ -4,9 +4,11 @@
 Create a route '/status' on the object app_views
 """
 
-from flask import jsonify
+from flask import abort, jsonify, request
 from api.v1.views import app_views
-from models import storage
+from api.v1.views.conditional import etag
+from api.v1.views.payloads import cached_response
+from models import storage, storage_t
 from models.amenity import Amenity
 from models.city import City
 from models.place import Place
@@ -36,12 +38,24 @@ def api_status():
 @app_views.route("/stats", methods=["GET"])
 def get_stats():
     """Get statistics of each object type"""
+    counts = storage.counts()
     statistics = {
-        "amenities": storage.count("Amenity"),
-        "cities": storage.count("City"),
-        "places": storage.count("Place"),
-        "reviews": storage.count("Review"),
-        "states": storage.count("State"),
-        "users": storage.count("User"),
+        name: counts.get(cls.__name__, 0) for name, cls in models.items()
     }
-    return jsonify(statistics)
+    tag = etag("stats", *sorted(statistics.items()))
+    return cached_response(tag, lambda: statistics)
+
+
+@app_views.route("/internal/metrics", methods=["GET"])
+def get_metrics():
+    """Get the storage cache, connection pool and lock metrics
+
+    Only answered to requests coming from the local host"""
+    if request.remote_addr not in ("127.0.0.1", "::1"):
+        abort(404)
+    metrics = {"cache": storage.stats()}
+    if storage_t == "db":
+        metrics["pool"] = storage.pool_stats()
+    else:
+        metrics["lock"] = storage.lock_stats()
+    return jsonify(metrics)
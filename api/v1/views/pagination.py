@@ -0,0 +1,107 @@
+#!/usr/bin/python3
+"""
+Pagination helpers for the collection views
+
+A collection is paged when the request has a 'limit' or an 'after'
+argument, the cursor of the next page is sent in the X-Next-Cursor
+header and goes in the 'after' argument of the next request.
+
+An unpaged collection is streamed when the request has a 'stream=1'
+argument: the objects are read lazily from the storage and the JSON
+array is sent in chunks instead of being built in memory.
+"""
+
+from api.v1.views.conditional import collection_tag, not_modified, validated
+from api.v1.views.payloads import cached_response
+from flask import Response, abort, jsonify, request, stream_with_context
+from models import storage
+from models.engine import cursor, serializer
+
+# integer - largest page a client can ask for
+MAX_LIMIT = 1000
+
+
+def page_args():
+    """Return the (limit, after) arguments of the request
+
+    limit is None when the request is not paged"""
+    limit = request.args.get("limit")
+    after = request.args.get("after")
+    if limit is None and after is None:
+        return None, None
+    try:
+        limit = MAX_LIMIT if limit is None else int(limit)
+    except ValueError:
+        abort(400, "Invalid limit")
+    if limit < 1:
+        abort(400, "Invalid limit")
+    if after is not None:
+        try:
+            cursor.decode(after)
+        except ValueError:
+            abort(400, "Invalid cursor")
+    return min(limit, MAX_LIMIT), after
+
+
+def page_response(objs, next_cursor=None):
+    """Return the JSON response listing objs"""
+    response = jsonify([storage.to_dict(obj) for obj in objs])
+    if next_cursor is not None:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return response
+
+
+def streaming():
+    """Return True if the request asks for a streamed response"""
+    return request.args.get("stream", "").lower() in ("1", "true")
+
+
+def stream_response(objs):
+    """Return the response streaming objs, an iterable of objects that
+    is consumed while the body is sent"""
+    dicts = (storage.to_dict(obj) for obj in objs)
+    body = serializer.iterdumps(dicts, sort_keys=True)
+    return Response(stream_with_context(body), mimetype="application/json")
+
+
+def paginate(cls, filters=None, cached=False):
+    """Return the response listing the cls objects matching filters,
+    the page is selected by the storage
+
+    A 304 response is returned when the ETag of the collection matches.
+    With cached, a request without arguments is answered from the
+    serialized payload cache"""
+    limit, after = page_args()
+    tag, last_modified = collection_tag(cls)
+    if cached and not request.args:
+        return cached_response(tag, lambda: [
+            storage.to_dict(obj) for obj in storage.iterate(cls, filters)
+        ], last_modified)
+    response = not_modified(tag)
+    if response is not None:
+        return response
+    if limit is None and streaming():
+        response = stream_response(storage.iterate(cls, filters))
+    else:
+        objs, next_cursor = storage.page(cls, filters, limit, after)
+        response = page_response(objs, next_cursor)
+    return validated(response, tag, last_modified)
+
+
+def paginate_list(search):
+    """Return the response listing the objects search(limit, after)
+    returns, the page is selected by the storage
+
+    search returns every object when limit and after are None, otherwise
+    at most limit objects following the cursor after in (created_at, id)
+    order"""
+    limit, after = page_args()
+    if limit is None:
+        objs = search(None, None)
+        if streaming():
+            return stream_response(objs)
+        return page_response(objs)
+    objs = list(search(limit + 1, after))
+    if len(objs) > limit:
+        return page_response(objs[:limit], cursor.encode(objs[limit - 1]))
+    return page_response(objs)
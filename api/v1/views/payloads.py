@@ -0,0 +1,70 @@
+#!/usr/bin/python3
+"""
+Serialized payload cache of the read-mostly endpoints
+
+The JSON bytes of a response are kept by request path along with the
+ETag they were built for, and compressed once per content coding the
+clients ask for: brotli when the brotli module is installed, then
+gzip. A request whose ETag is unchanged is answered from those bytes,
+a new ETag means the underlying objects changed and the bytes are
+built again.
+"""
+
+from api.v1.views.conditional import not_modified, validated
+from flask import Response, request
+import gzip
+from models.engine import serializer
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# integer - smallest body worth compressing, in bytes
+MIN_SIZE = 1024
+
+# dictionary - [ETag, JSON bytes, {content coding: bytes}] by path, an
+# entry is replaced whole when its ETag changes
+payloads = {}
+
+
+def encoding():
+    """Return the content coding of the response to the request"""
+    codings = ["br", "gzip"] if brotli is not None else ["gzip"]
+    return request.accept_encodings.best_match(codings, "identity")
+
+
+def compress(body, coding):
+    """Return body compressed with the content coding"""
+    if coding == "br":
+        return brotli.compress(body)
+    if coding == "gzip":
+        return gzip.compress(body)
+    return body
+
+
+def cached_response(tag, build, last_modified=None):
+    """Return the JSON response of the object build() returns, built
+    only when tag differs from the one of the cached bytes
+
+    The ETag of a compressed response is suffixed with its coding"""
+    coding = encoding()
+    for tagged in (tag, tag + "-" + coding):
+        response = not_modified(tagged)
+        if response is not None:
+            return response
+    entry = payloads.get(request.path)
+    if entry is None or entry[0] != tag:
+        body = (serializer.dumps(build(), sort_keys=True) + "\n").encode()
+        entry = [tag, body, {"identity": body}]
+        payloads[request.path] = entry
+    if len(entry[1]) < MIN_SIZE:
+        coding = "identity"
+    body = entry[2].get(coding)
+    if body is None:
+        body = entry[2][coding] = compress(entry[1], coding)
+    response = Response(body, mimetype="application/json")
+    if coding != "identity":
+        response.headers["Content-Encoding"] = coding
+        tag += "-" + coding
+    response.vary.add("Accept-Encoding")
+    return validated(response, tag, last_modified)
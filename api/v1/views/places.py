@@ -8,6 +8,8 @@ from models.user import User
 from models.state import State
 from models.amenity import Amenity
 from api.v1.views import app_views
+from api.v1.views.conditional import object_response
+from api.v1.views.pagination import paginate, paginate_list
 from flask import abort, request, jsonify
 
 
@@ -21,10 +23,7 @@ def get_all_places(city_id):
     city = storage.get(City, city_id)
     if not city:
         abort(404)
-    places = [
-        place.to_dict() for place in storage.all(Place).values()
-        if place.city_id == city_id]
-    return jsonify(places), 200
+    return paginate(Place, {"city_id": city_id})
 
 
 # API ROUTE: '/places/<place_id>'          method: GET
@@ -37,7 +36,7 @@ def get_place(place_id):
     place = storage.get(Place, place_id)
     if not place:
         abort(404)
-    return jsonify(place.to_dict()), 200
+    return object_response(place)
 
 
 # API ROUTE: '/places/<place_id>'          method: DELETE
@@ -111,7 +110,7 @@ def update_place(place_id):
     for key, value in data.items():
         if key not in ignore_keys:
             setattr(place, key, value)
-    storage.save()
+    place.save()
     return jsonify(place.to_dict()), 200
 
 
@@ -126,7 +125,7 @@ def places_search():
     of the request
     """
 
-    data = request.get(silent=True)
+    data = request.get_json(silent=True)
 
     if data is None:
         abort(400, "Not a JSON")
@@ -134,42 +133,17 @@ def places_search():
     states = data.get('states', [])
     cities = data.get('cities', [])
     amenities = data.get('amenities', [])
-    places = set()
-
-    # if states & cities empty get all Place objects
-    if not len(states) + len(cities):
-        places.update(storage.all(Place).values())
-        if len(amenities) == 0:
-            response = [place.to_dict() for place in places]
-            return jsonify(response)
-    else:
-        for state_id in states:
-            state = storage.get(State, state_id)
-            if state is None:
-                abort(404)
-            for city in state.cities:
-                places.update(city.places)
-
-        for city_id in cities:
-            city = storage.get(City, city_id)
-            if city is None:
-                abort(404)
-            places.update(city.places)
-
-    if len(amenities) == 0:
-        response = [place.to_dict() for place in places]
-        return jsonify(response)
-    # Filter results:
-    am_filter = [
-        storage.get(Amenity, amenity_id) for amenity_id in amenities
+
+    for state_id in states:
+        if storage.get(State, state_id) is None:
+            abort(404)
+    for city_id in cities:
+        if storage.get(City, city_id) is None:
+            abort(404)
+    # unknown amenities do not filter anything out
+    amenities = [
+        amenity_id for amenity_id in amenities
         if storage.get(Amenity, amenity_id) is not None]
-    results = set()
-
-    for place in places:
-        if len(set(am_filter).intersection(set(place.amenities))):
-            try:
-                del place.amenities
-            except AttributeError:
-                pass
-            results.add(place)
-    return jsonify([place.to_dict() for place in results])
+
+    return paginate_list(lambda limit, after: storage.search_places(
+        states, cities, amenities, limit, after))
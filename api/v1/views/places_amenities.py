@@ -41,10 +41,20 @@ def delete_place_amenity(place_id, amenity_id):
     if not amenity:
         abort(404)
 
+    if storage_t != 'db':
+        if amenity.id not in place.amenity_ids:
+            abort(404)
+        # assign a new list so that the storage indexes follow
+        place.amenity_ids = [
+            amenity_id for amenity_id in place.amenity_ids
+            if amenity_id != amenity.id]
+        place.save()
+        return jsonify({}), 200
+
     for _amenity_ in place.amenities:
         if _amenity_.id == amenity.id:
             place.amenities.remove(amenity)
-            storage.save()
+            place.save()
             return jsonify({}), 200
     # If amenity not found return 404 Error
     abort(404)
@@ -60,6 +70,14 @@ def linkAmenityPlace(place_id, amenity_id):
     amenity = storage.get(Amenity, amenity_id)
     if not amenity:
         abort(404)
+    if storage_t != 'db':
+        if amenity.id in place.amenity_ids:
+            return jsonify(amenity.to_dict()), 200
+        # assign a new list so that the storage indexes follow
+        place.amenity_ids = place.amenity_ids + [amenity.id]
+        place.save()
+        return jsonify(amenity.to_dict()), 201
+
     found = False
     for a in place.amenities:
         if a.id == amenity.id:
@@ -68,5 +86,5 @@ def linkAmenityPlace(place_id, amenity_id):
     if found:
         return jsonify(amenity.to_dict()), 200
     place.amenities.append(amenity)
-    storage.save()
+    place.save()
     return jsonify(amenity.to_dict()), 201
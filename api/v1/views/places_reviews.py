@@ -7,6 +7,8 @@ from models.place import Place
 from models.review import Review
 from models.user import User
 from api.v1.views import app_views
+from api.v1.views.conditional import object_response
+from api.v1.views.pagination import paginate
 from flask import abort, request, jsonify
 
 
@@ -20,10 +22,7 @@ def get_all_reviews(place_id):
     place = storage.get(Place, place_id)
     if not place:
         abort(404)
-    reviews = [
-        review.to_dict() for review in storage.all(Review).values()
-        if review.place_id == place_id]
-    return jsonify(reviews), 200
+    return paginate(Review, {"place_id": place_id})
 
 
 # API ROUTE: '/reviews/<review_id>'       method: GET
@@ -36,7 +35,7 @@ def get_review(review_id):
     review = storage.get(Review, review_id)
     if not review:
         abort(404)
-    return jsonify(review.to_dict()), 200
+    return object_response(review)
 
 
 # API ROUTE: '/reviews/<review_id>'       method: DELETE
@@ -110,5 +109,5 @@ def update_review(review_id):
     for key, value in data.items():
         if key not in ignore_keys:
             setattr(review, key, value)
-    storage.save()
+    review.save()
     return jsonify(review.to_dict()), 200
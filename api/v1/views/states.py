@@ -6,6 +6,8 @@ Create new view for state objects
 from flask import abort, jsonify, request
 from models.state import State
 from api.v1.views import app_views
+from api.v1.views.conditional import object_response
+from api.v1.views.pagination import paginate
 from models import storage
 
 
@@ -16,9 +18,7 @@ from models import storage
                  strict_slashes=False)
 def get_all_states():
     """Get list of all state objects"""
-    states = storage.all(State).values()
-    state_list = [state.to_dict() for state in states]
-    return jsonify(state_list)
+    return paginate(State, cached=True)
 
 
 # API ROUTE: /states/<state_id>     method=GET
@@ -29,7 +29,7 @@ def get_all_states():
 def get_one_state(state_id):
     """Get state object with state.id==state_id"""
     state = storage.get(State, state_id)
-    return jsonify(state.to_dict()) if state else abort(404)
+    return object_response(state) if state else abort(404)
 
 
 # API ROUTE: /states/<state_id>     method=DELETE
@@ -110,5 +110,5 @@ def not_found(error):
 @app_views.errorhandler(400)
 def bad_request(error):
     """Handles Bad Request Error: 400"""
-    response = {"error": "Not found"}
-    return jsonify(response), 404
+    response = {"error": error.description}
+    return jsonify(response), 400
@@ -2,6 +2,8 @@
 """User RESTFul API module"""
 
 from api.v1.views import app_views
+from api.v1.views.conditional import object_response
+from api.v1.views.pagination import paginate
 from flask import abort, jsonify, request
 from models import storage
 from models.user import User
@@ -14,8 +16,7 @@ from models.user import User
                  strict_slashes=False)
 def get_all_users():
     """Get all users"""
-    response = [user.to_dict() for user in storage.all(User).values()]
-    return jsonify(response), 200
+    return paginate(User)
 
 
 # API ROUTE: '/users/<user_id>'      method=GET
@@ -28,7 +29,7 @@ def get_user(user_id):
     user = storage.get(User, user_id)
     if not user:
         abort(404)
-    return jsonify(user.to_dict()), 200
+    return object_response(user)
 
 
 # API ROUTE: '/users/<user_id>'      method=DELETE
@@ -85,5 +86,5 @@ def update_user(user_id):
     for key, value in data.items():
         if key not in ignore_keys:
             setattr(user, key, value)
-    storage.save()
+    user.save()
     return jsonify(user.to_dict()), 200
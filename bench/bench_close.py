@@ -0,0 +1,56 @@
+#!/usr/bin/python3
+"""
+Benchmark of the request teardown on the file storage
+
+Stores N places, then times GET /api/v1/status through the Flask test
+client with the change check storage.close() does and with the full
+reload it used to do, along with a single call of each.
+
+Usage: python3 bench/bench_close.py [objects]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+
+def rate(client, seconds=2.0):
+    """Return the requests per second of GET /api/v1/status"""
+    count = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        client.get("/api/v1/status")
+        count += 1
+    return count / (time.perf_counter() - start)
+
+
+def main(count):
+    """Run the benchmark over count places"""
+    from api.v1.app import app
+    from models import storage
+    from models.place import Place
+
+    for i in range(count):
+        storage.new(Place(name="place {}".format(i), city_id="c",
+                          user_id="u"))
+    storage.save()
+    storage.reload()
+    client = app.test_client()
+    for name, close in (("change check", storage.close),
+                        ("full reload", storage.reload)):
+        # the storage keeps its bound methods, the teardown calls this one
+        storage.__dict__["close"] = close
+        start = time.perf_counter()
+        close()
+        single = time.perf_counter() - start
+        print("{:12s} close() {:10.1f}us  GET /status {:8.1f} req/s".format(
+            name, single * 1e6, rate(client)))
+    del storage.__dict__["close"]
+
+
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.dirname(os.path.dirname(
+        os.path.abspath(__file__))))
+    os.chdir(tempfile.mkdtemp())
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
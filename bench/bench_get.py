@@ -0,0 +1,75 @@
+#!/usr/bin/python3
+"""
+Benchmark of storage.get as the dataset grows
+
+Stores places up to each size given, 1k, 10k, 100k and 1M by default,
+then times storage.get of random ids, the scan of storage.all(cls) that
+get used to do, and GET /api/v1/places/<place_id> through the Flask
+test client. The get latency should stay flat while the scan grows
+with the number of places.
+
+Usage: python3 bench/bench_get.py [size ...]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+
+def scan(storage, cls, id):
+    """Return the cls object of id by scanning every cls object"""
+    for obj in storage.all(cls).values():
+        if obj.id == id:
+            return obj
+    return None
+
+
+def per_call(function, args):
+    """Return the best microseconds per call of function over args"""
+    best = None
+    for i in range(3):
+        start = time.perf_counter()
+        for arg in args:
+            function(*arg)
+        seconds = (time.perf_counter() - start) / len(args)
+        if best is None or seconds < best:
+            best = seconds
+    return best * 1e6
+
+
+def main(sizes):
+    """Run the benchmark over each of sizes places"""
+    from api.v1.app import app
+    from models import storage
+    from models.place import Place
+
+    rand = random.Random(0)
+    client = app.test_client()
+    ids = []
+    for size in sorted(sizes):
+        while len(ids) < size:
+            place = Place(name="place {}".format(len(ids)), city_id="c",
+                          user_id="u")
+            storage.new(place)
+            ids.append(place.id)
+        sample = [(Place, rand.choice(ids)) for i in range(1000)]
+        assert all(storage.get(cls, id) is scan(storage, cls, id)
+                   for cls, id in sample[:3])
+        got = per_call(storage.get, sample)
+        scanned = per_call(lambda cls, id: scan(storage, cls, id),
+                           sample[:max(3, 100000 // size)])
+        urls = [("/api/v1/places/" + id,) for cls, id in sample[:200]]
+        fetched = per_call(client.get, urls)
+        print("{:8d} places  get {:7.2f}us  scan {:11.1f}us  "
+              "GET /places/<id> {:7.1f}us".format(size, got, scanned,
+                                                  fetched))
+
+
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.dirname(os.path.dirname(
+        os.path.abspath(__file__))))
+    os.chdir(tempfile.mkdtemp())
+    main([int(size) for size in sys.argv[1:]] or
+         [1000, 10000, 100000, 1000000])
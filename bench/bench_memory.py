@@ -0,0 +1,84 @@
+#!/usr/bin/python3
+"""
+Memory benchmark of the objects FileStorage keeps after a reload
+
+Writes a snapshot of N reviews spread over 50 places and 50 users,
+reloads it under tracemalloc and prints the bytes allocated per
+object. It also prints the size of an instance with its dictionary
+next to the size of an instance holding the same attributes in
+__slots__. Each revision given is extracted with git archive and
+measured the same way, so that the figures before and after a change
+can be compared.
+
+Usage: python3 bench/bench_memory.py [objects] [revision ...]
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import tracemalloc
+import uuid
+
+
+def snapshot(count):
+    """Write file.json holding count reviews"""
+    places = [str(uuid.uuid4()) for i in range(50)]
+    users = [str(uuid.uuid4()) for i in range(50)]
+    objects = {}
+    for i in range(count):
+        review = {"__class__": "Review", "id": str(uuid.uuid4()),
+                  "created_at": "2024-01-01T00:00:00.{:06d}".format(i),
+                  "updated_at": "2024-01-01T00:00:00.{:06d}".format(i),
+                  "text": "review", "place_id": places[i % 50],
+                  "user_id": users[i % 50]}
+        objects["Review." + review["id"]] = review
+    with open("file.json", "w") as f:
+        json.dump(objects, f)
+
+
+def measure(count):
+    """Print the bytes per object of a reload of count reviews"""
+    from models import storage
+
+    snapshot(count)
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    storage.reload()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    reviews = [obj for key, obj in storage.all().items()
+               if key.startswith("Review.")]
+    shares = [sys.getsizeof(review) + sys.getsizeof(review.__dict__)
+              for review in reviews]
+    slotted = type("Slotted", (), {"__slots__": list(reviews[0].__dict__)})
+    print("{:.0f} bytes/object, instance and __dict__ {:.0f}, same "
+          "attributes in __slots__ {}".format(
+              (after - before) / count, sum(shares) / len(shares),
+              sys.getsizeof(slotted())))
+
+
+def extract(revision):
+    """Return a temporary directory holding the tree of revision"""
+    path = tempfile.mkdtemp()
+    archive = subprocess.run(["git", "archive", revision], check=True,
+                             stdout=subprocess.PIPE, cwd=root).stdout
+    subprocess.run(["tar", "-x", "-C", path], input=archive, check=True)
+    return path
+
+
+if __name__ == "__main__":
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    if len(sys.argv) > 2 and sys.argv[2] == "--measure":
+        os.chdir(tempfile.mkdtemp())
+        measure(count)
+        sys.exit(0)
+    for revision, tree in [("working tree", root)] + [
+            (revision, extract(revision)) for revision in sys.argv[2:]]:
+        print(revision + ": ", end="", flush=True)
+        env = dict(os.environ, PYTHONPATH=tree)
+        env.pop("HBNB_TYPE_STORAGE", None)
+        subprocess.run([sys.executable, os.path.abspath(__file__),
+                        str(count), "--measure"], env=env, check=True)
@@ -0,0 +1,96 @@
+#!/usr/bin/python3
+"""
+Benchmark of places_search on the file storage
+
+Builds N places over 1000 cities in 50 states, each place having 5 of
+50 amenities, then times storage.search_places against a scan of every
+place for a few queries, checking both give the same places, and
+times POST /api/v1/places_search through the Flask test client.
+
+Usage: python3 bench/bench_search.py [places]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+
+def scan(places, cities, states, city_ids, amenities):
+    """Return the ids of the places matching the query, checking every
+    place"""
+    wanted = set(city_ids)
+    wanted.update(city.id for city in cities if city.state_id in states)
+    return {place.id for place in places
+            if (not states and not city_ids or place.city_id in wanted) and
+            all(amenity in place.amenity_ids for amenity in amenities)}
+
+
+def timed(function, *args):
+    """Return the result of function(*args) and its duration in ms"""
+    start = time.perf_counter()
+    result = function(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main(count):
+    """Run the benchmark over count places"""
+    from api.v1.app import app
+    from models import storage
+    from models.amenity import Amenity
+    from models.city import City
+    from models.place import Place
+    from models.state import State
+
+    rand = random.Random(0)
+    states = [State(name="state {}".format(i)) for i in range(50)]
+    cities = [City(name="city {}".format(i), state_id=states[i % 50].id)
+              for i in range(1000)]
+    amenities = [Amenity(name="amenity {}".format(i)) for i in range(50)]
+    for obj in states + cities + amenities:
+        storage.new(obj)
+    start = time.perf_counter()
+    for i in range(count):
+        storage.new(Place(name="place {}".format(i), user_id="u",
+                          city_id=rand.choice(cities).id,
+                          amenity_ids=[amenity.id for amenity in
+                                       rand.sample(amenities, 5)]))
+    print("{} places indexed in {:.1f}s".format(
+        count, time.perf_counter() - start))
+    places = list(storage.all(Place).values())
+    queries = {
+        "1 state": ([states[0].id], [], []),
+        "10 cities": ([], [city.id for city in cities[:10]], []),
+        "1 amenity": ([], [], [amenities[0].id]),
+        "3 amenities": ([], [], [amenity.id for amenity in amenities[:3]]),
+        "1 state, 2 amenities": ([states[1].id], [],
+                                 [amenities[1].id, amenities[2].id]),
+        "5 states, 10 cities, 1 amenity": (
+            [state.id for state in states[:5]],
+            [city.id for city in cities[100:110]], [amenities[3].id]),
+    }
+    for name, (state_ids, city_ids, amenity_ids) in queries.items():
+        found, indexed = timed(storage.search_places, state_ids, city_ids,
+                               amenity_ids)
+        expected, scanned = timed(scan, places, cities, set(state_ids),
+                                  city_ids, amenity_ids)
+        assert {place.id for place in found} == expected, name
+        print("{:32s} {:6d} places  indexed {:7.1f}ms  scan {:7.1f}ms"
+              .format(name, len(found), indexed, scanned))
+    client = app.test_client()
+    body = {"states": [states[1].id],
+            "amenities": [amenities[1].id, amenities[2].id]}
+    url = "/api/v1/places_search?limit=100"
+    client.post(url, json=body)
+    start = time.perf_counter()
+    response = client.post(url, json=body)
+    print("POST /api/v1/places_search?limit=100 {} in {:.1f}ms".format(
+        response.status_code, (time.perf_counter() - start) * 1000))
+
+
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.dirname(os.path.dirname(
+        os.path.abspath(__file__))))
+    os.chdir(tempfile.mkdtemp())
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,78 @@
+#!/usr/bin/python3
+"""
+Benchmark of the JSON serializer backends
+
+For json and each of orjson and ujson that is installed, times dumps
+and loads over N place dictionaries, a FileStorage save and reload of
+N places, and GET /api/v1/cities/<city_id>/places listing them through
+the Flask test client.
+
+Usage: python3 bench/bench_serializer.py [objects]
+"""
+
+import importlib
+import os
+import sys
+import tempfile
+import time
+import timeit
+
+
+def best(statement, repeat=5):
+    """Return the fastest of repeat runs of statement in seconds"""
+    return min(timeit.repeat(statement, number=1, repeat=repeat))
+
+
+def main(count):
+    """Run the benchmark over count places"""
+    from api.v1.app import app
+    from models import storage
+    from models.city import City
+    from models.engine import serializer
+    from models.place import Place
+    from models.state import State
+
+    backends = ["json"]
+    for name in ("orjson", "ujson"):
+        try:
+            setattr(serializer, name, importlib.import_module(name))
+            backends.append(name)
+        except ImportError:
+            pass
+    state = State(name="California")
+    city = City(name="San Francisco", state_id=state.id)
+    for obj in (state, city):
+        storage.new(obj)
+    for i in range(count):
+        storage.new(Place(name="place {}".format(i), city_id=city.id,
+                          user_id="u", number_rooms=i % 5,
+                          latitude=37.77, longitude=-122.41))
+    dicts = [place.to_dict() for place in storage.all(Place).values()]
+    client = app.test_client()
+    url = "/api/v1/cities/{}/places".format(city.id)
+    bodies = {}
+    for backend in backends:
+        serializer.backend = backend
+        string = serializer.dumps(dicts)
+        dumped = best(lambda: serializer.dumps(dicts))
+        loaded = best(lambda: serializer.loads(string))
+        saved = best(storage.save, 3)
+        reloaded = best(storage.reload, 3)
+        client.get(url)
+        start = time.perf_counter()
+        for i in range(10):
+            response = client.get(url)
+        listed = (time.perf_counter() - start) / 10
+        bodies[backend] = response.get_json()
+        print("{:7s} dumps {:6.1f}ms loads {:6.1f}ms save {:6.1f}ms "
+              "reload {:6.1f}ms GET places {:6.1f}ms".format(
+                  backend, dumped * 1000, loaded * 1000, saved * 1000,
+                  reloaded * 1000, listed * 1000))
+    assert all(body == bodies["json"] for body in bodies.values())
+
+
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.dirname(os.path.dirname(
+        os.path.abspath(__file__))))
+    os.chdir(tempfile.mkdtemp())
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
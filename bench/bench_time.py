@@ -0,0 +1,76 @@
+#!/usr/bin/python3
+"""
+Micro-benchmark of the BaseModel timestamp codec
+
+Checks that parse_time and format_time give the same results as
+strptime and strftime, times both pairs per call, then times a
+FileStorage save and reload with each pair and compares the files.
+
+Usage: python3 bench/bench_time.py [objects]
+"""
+
+from datetime import datetime, timedelta
+import os
+import sys
+import tempfile
+import time
+import timeit
+
+
+def measure(storage, count):
+    """Return the seconds of a save then of a reload of storage"""
+    start = time.perf_counter()
+    storage.save()
+    saved = time.perf_counter() - start
+    start = time.perf_counter()
+    storage.reload()
+    return saved, time.perf_counter() - start
+
+
+def main(count):
+    """Run the benchmark over count objects"""
+    from models import base_model, storage
+    from models.base_model import format_time, parse_time
+    from models.review import Review
+
+    fmt = base_model.time
+    dates = [datetime(2024, 1, 1) + timedelta(seconds=i * 7.000013)
+             for i in range(count)]
+    for date in dates:
+        string = date.strftime(fmt)
+        assert format_time(date) == string, string
+        assert parse_time(string) == datetime.strptime(string, fmt), string
+    print("codec output identical to strftime/strptime over {} dates"
+          .format(count))
+
+    string = dates[1].strftime(fmt)
+    for name, statement in (
+            ("strptime", lambda: datetime.strptime(string, fmt)),
+            ("parse_time", lambda: parse_time(string)),
+            ("strftime", lambda: dates[1].strftime(fmt)),
+            ("format_time", lambda: format_time(dates[1]))):
+        seconds = min(timeit.repeat(statement, number=10000, repeat=5))
+        print("{:12s} {:8.3f} us/call".format(name, seconds * 100))
+
+    for i in range(count):
+        storage.new(Review(text="review", place_id="p", user_id="u"))
+    codecs = {"iso": (parse_time, format_time),
+              "strptime": (lambda string: datetime.strptime(string, fmt),
+                           lambda date: date.strftime(fmt))}
+    files = {}
+    for name in ("strptime", "iso"):
+        base_model.parse_time, base_model.format_time = codecs[name]
+        saved, loaded = measure(storage, count)
+        with open("file.json", "rb") as f:
+            files[name] = f.read()
+        print("{:8s} save {:.3f}s reload {:.3f}s".format(name, saved,
+                                                         loaded))
+    assert files["iso"] == files["strptime"]
+    print("snapshots byte-identical")
+
+
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.dirname(os.path.dirname(
+        os.path.abspath(__file__))))
+    os.chdir(tempfile.mkdtemp())
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
@@ -3,6 +3,7 @@
 initialize the models package
 """
 
+from models.engine.cache import Cache
 from os import getenv
 
 
@@ -10,8 +11,8 @@ storage_t = getenv("HBNB_TYPE_STORAGE")
 
 if storage_t == "db":
     from models.engine.db_storage import DBStorage
-    storage = DBStorage()
+    storage = Cache(DBStorage())
 else:
     from models.engine.file_storage import FileStorage
-    storage = FileStorage()
+    storage = Cache(FileStorage())
 storage.reload()
@@ -8,10 +8,28 @@ import models
 from os import getenv
 import sqlalchemy
 from sqlalchemy import Column, String, DateTime
+from sqlalchemy.dialects import mysql
 from sqlalchemy.ext.declarative import declarative_base
 import uuid
 
 time = "%Y-%m-%dT%H:%M:%S.%f"
+# column type of the timestamps, MySQL DATETIME drops the microseconds
+# unless asked to keep them, and updated_at must change on every save
+timestamp = DateTime().with_variant(mysql.DATETIME(fsp=6), "mysql")
+
+
+def parse_time(string):
+    """converts a string written by format_time back to a datetime"""
+    try:
+        return datetime.fromisoformat(string)
+    except ValueError:
+        # older interpreters only accept 3 or 6 fractional digits
+        return datetime.strptime(string, time)
+
+
+def format_time(date):
+    """converts a datetime to the string format given by time"""
+    return date.isoformat(timespec="microseconds")
 
 if models.storage_t == "db":
     Base = declarative_base()
@@ -23,8 +41,8 @@ class BaseModel:
     """The BaseModel class from which future classes will be derived"""
     if models.storage_t == "db":
         id = Column(String(60), primary_key=True)
-        created_at = Column(DateTime, default=datetime.utcnow)
-        updated_at = Column(DateTime, default=datetime.utcnow)
+        created_at = Column(timestamp, default=datetime.utcnow)
+        updated_at = Column(timestamp, default=datetime.utcnow)
 
     def __init__(self, *args, **kwargs):
         """Initialization of the base model"""
@@ -33,11 +51,15 @@ class BaseModel:
                 if key != "__class__":
                     setattr(self, key, value)
             if kwargs.get("created_at", None) and type(self.created_at) is str:
-                self.created_at = datetime.strptime(kwargs["created_at"], time)
+                self.created_at = parse_time(kwargs["created_at"])
             else:
                 self.created_at = datetime.utcnow()
             if kwargs.get("updated_at", None) and type(self.updated_at) is str:
-                self.updated_at = datetime.strptime(kwargs["updated_at"], time)
+                if kwargs["updated_at"] == kwargs.get("created_at"):
+                    # datetimes are immutable, share the parsed one
+                    self.updated_at = self.created_at
+                else:
+                    self.updated_at = parse_time(kwargs["updated_at"])
             else:
                 self.updated_at = datetime.utcnow()
             if kwargs.get("id", None) is None:
@@ -52,6 +74,12 @@ class BaseModel:
         return "[{:s}] ({:s}) {}".format(self.__class__.__name__, self.id,
                                          self.__dict__)
 
+    if models.storage_t != "db":
+        def __setattr__(self, name, value):
+            """sets an attribute and lets the storage update its indexes"""
+            super().__setattr__(name, value)
+            models.storage.touch(self, name)
+
     def save(self):
         """updates the attribute 'updated_at' with the current datetime"""
         self.updated_at = datetime.utcnow()
@@ -62,9 +90,9 @@ class BaseModel:
         """returns a dictionary containing all keys/values of the instance"""
         new_dict = self.__dict__.copy()
         if "created_at" in new_dict:
-            new_dict["created_at"] = new_dict["created_at"].strftime(time)
+            new_dict["created_at"] = format_time(new_dict["created_at"])
         if "updated_at" in new_dict:
-            new_dict["updated_at"] = new_dict["updated_at"].strftime(time)
+            new_dict["updated_at"] = format_time(new_dict["updated_at"])
         new_dict["__class__"] = self.__class__.__name__
         if "_sa_instance_state" in new_dict:
             del new_dict["_sa_instance_state"]
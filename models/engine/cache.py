@@ -0,0 +1,156 @@
+#!/usr/bin/python3
+"""
+Contains the class Cache, a read-through cache around a storage engine
+
+The objects read with get and their to_dict() payloads are kept for
+HBNB_CACHE_TTL seconds (60 by default, 0 for no expiry) in a least
+recently used dictionary of HBNB_CACHE_SIZE entries. The storage
+notifies the cache of the objects added, changed or deleted so that
+their entries are dropped. Without HBNB_CACHE_SIZE every call goes
+straight to the storage.
+
+A storage whose objects belong to a session, DBStorage, provides
+attach to bind a cached object to the current session. FileStorage
+keeps every object in memory, its cached objects are served as they
+are.
+"""
+
+from collections import OrderedDict
+from os import getenv
+import threading
+import time
+
+
+class Cache:
+    """caches the objects and payloads read from a storage engine"""
+
+    def __init__(self, storage, size=None, ttl=None):
+        """Instantiate a Cache of size entries around storage"""
+        if size is None:
+            size = int(getenv("HBNB_CACHE_SIZE") or 0)
+        if ttl is None:
+            ttl = float(getenv("HBNB_CACHE_TTL") or 60)
+        # storage engine - where the objects are read from and written to
+        self.__storage = storage
+        # callable - binds a cached object to the storage session, None
+        # when the objects are not bound to a session
+        self.__attach = getattr(storage, "attach", None)
+        # integer - largest number of entries, 0 disables the cache
+        self.__size = size
+        # float - seconds an entry is kept, 0 for no expiry
+        self.__ttl = ttl
+        # dictionary - [expiry, object, payload, object the payload was
+        # built from, its updated_at] by <class name>.id, least recently
+        # used first, the object is None when only a payload is cached
+        self.__entries = OrderedDict()
+        # integer - bumped by every invalidation so that entries read
+        # before it are not stored after it
+        self.__generation = 0
+        # lock - guards the entries, generation and counters
+        self.__lock = threading.Lock()
+        # integers - lookups answered, or not, from the cache
+        self.__hits = 0
+        self.__misses = 0
+        if size:
+            storage.listen(self.invalidate)
+
+    def __getattr__(self, name):
+        """Return the attribute name of the storage, its methods are
+        kept on the cache so that the next calls skip this lookup"""
+        if name.startswith("_Cache__"):
+            raise AttributeError(name)
+        value = getattr(self.__storage, name)
+        if callable(value):
+            self.__dict__[name] = value
+        return value
+
+    def get(self, cls, id):
+        """Return the cls object of id, from the cache when possible"""
+        if not self.__size or type(id) is not str:
+            return self.__storage.get(cls, id)
+        name = cls if type(cls) is str else cls.__name__
+        generation, entry = self.__lookup(name + "." + id)
+        if entry is not None and entry[1] is not None:
+            if self.__attach is None:
+                return entry[1]
+            obj = self.__attach(entry[1])
+            if obj is not None:
+                return obj
+        obj = self.__storage.get(cls, id)
+        if obj is not None:
+            self.__store(obj, generation)
+        return obj
+
+    def to_dict(self, obj):
+        """Return obj.to_dict(), from the cache when obj did not change
+        since its payload was stored
+
+        The payload is served to the instance it was built from, its
+        changes drop the entry. With a session each request reads its
+        own instance, the payload is then served to the instance of the
+        session when it has no unsaved change and the same updated_at.
+        The payload is shared and must not be modified"""
+        if not self.__size:
+            return obj.to_dict()
+        generation, entry = self.__lookup(obj.__class__.__name__ + "." +
+                                          obj.id)
+        if entry is not None and entry[2] is not None and (
+                entry[3] is obj or self.__attach is not None and
+                entry[4] == getattr(obj, "updated_at", None) and
+                self.__attach(obj) is obj):
+            return entry[2]
+        payload = obj.to_dict()
+        self.__store(obj, generation, payload)
+        return payload
+
+    def invalidate(self, keys=None):
+        """Drop the entries of keys, every entry when keys is None"""
+        with self.__lock:
+            self.__generation += 1
+            if keys is None:
+                self.__entries.clear()
+                return
+            for key in keys:
+                self.__entries.pop(key, None)
+
+    def stats(self):
+        """Return the size, number of entries, hits and misses"""
+        with self.__lock:
+            return {"size": self.__size, "entries": len(self.__entries),
+                    "hits": self.__hits, "misses": self.__misses}
+
+    def __lookup(self, key):
+        """Return the current generation and the live entry of key, or
+        None, counting the hit or miss"""
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is not None and self.__ttl and entry[0] < time.time():
+                del self.__entries[key]
+                entry = None
+            if entry is None:
+                self.__misses += 1
+            else:
+                self.__entries.move_to_end(key)
+                self.__hits += 1
+            return self.__generation, entry
+
+    def __store(self, obj, generation, payload=None):
+        """stores obj read from the storage, or the payload built from obj
+        when given, unless an invalidation happened since generation,
+        evicting the least recently used entries"""
+        key = obj.__class__.__name__ + "." + obj.id
+        with self.__lock:
+            if generation != self.__generation:
+                return
+            entry = self.__entries.get(key)
+            if entry is None:
+                entry = [None, None, None, None, None]
+            if payload is None:
+                entry[1] = obj
+            else:
+                entry[2:] = [payload, obj, getattr(obj, "updated_at", None)]
+            entry[0] = time.time() + self.__ttl
+            self.__entries[key] = entry
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.__size:
+                self.__entries.popitem(last=False)
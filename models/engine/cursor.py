@@ -0,0 +1,29 @@
+#!/usr/bin/python3
+"""
+Contains the keyset cursors used by storage.page
+
+A cursor is the url safe base64 of "<created_at> <id>" of the last
+object of a page, the next page starts right after it.
+"""
+
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from models.base_model import format_time, parse_time
+
+
+def encode(obj):
+    """returns the cursor pointing right after obj"""
+    position = format_time(obj.created_at) + " " + obj.id
+    return urlsafe_b64encode(position.encode("utf-8")).decode().rstrip("=")
+
+
+def decode(cursor):
+    """returns the (created_at, id) pair of cursor
+
+    Raises ValueError if cursor was not returned by encode"""
+    try:
+        padding = "=" * (-len(cursor) % 4)
+        position = urlsafe_b64decode(cursor + padding).decode("utf-8")
+        created_at, id = position.split(" ", 1)
+        return parse_time(created_at), id
+    except (TypeError, UnicodeError, ValueError):
+        raise ValueError("invalid cursor: {}".format(cursor))
@@ -7,14 +7,18 @@ import models
 from models.amenity import Amenity
 from models.base_model import BaseModel, Base
 from models.city import City
+from models.engine import cursor
+from models.engine.pool import MeteredPool
 from models.place import Place
 from models.review import Review
 from models.state import State
 from models.user import User
+from itertools import chain
 from os import getenv
 import sqlalchemy
-from sqlalchemy import create_engine
-from sqlalchemy.orm import scoped_session, sessionmaker
+import time
+from sqlalchemy import and_, create_engine, event, func, or_
+from sqlalchemy.orm import scoped_session, selectinload, sessionmaker
 
 classes = {"Amenity": Amenity, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
@@ -32,25 +36,75 @@ class DBStorage:
         HBNB_MYSQL_HOST = getenv('HBNB_MYSQL_HOST')
         HBNB_MYSQL_DB = getenv('HBNB_MYSQL_DB')
         HBNB_ENV = getenv('HBNB_ENV')
+        HBNB_MYSQL_POOL_SIZE = int(getenv('HBNB_MYSQL_POOL_SIZE') or 5)
+        HBNB_MYSQL_MAX_OVERFLOW = int(getenv('HBNB_MYSQL_MAX_OVERFLOW') or 10)
+        HBNB_MYSQL_POOL_TIMEOUT = float(getenv('HBNB_MYSQL_POOL_TIMEOUT',
+                                               '') or 30)
+        HBNB_MYSQL_POOL_RECYCLE = int(getenv('HBNB_MYSQL_POOL_RECYCLE',
+                                             '') or 3600)
+        HBNB_MYSQL_POOL_PRE_PING = getenv('HBNB_MYSQL_POOL_PRE_PING') == "1"
         self.__engine = create_engine('mysql+mysqldb://{}:{}@{}/{}'.
                                       format(HBNB_MYSQL_USER,
                                              HBNB_MYSQL_PWD,
                                              HBNB_MYSQL_HOST,
-                                             HBNB_MYSQL_DB))
+                                             HBNB_MYSQL_DB),
+                                      poolclass=MeteredPool,
+                                      pool_size=HBNB_MYSQL_POOL_SIZE,
+                                      max_overflow=HBNB_MYSQL_MAX_OVERFLOW,
+                                      pool_timeout=HBNB_MYSQL_POOL_TIMEOUT,
+                                      pool_recycle=HBNB_MYSQL_POOL_RECYCLE,
+                                      pool_pre_ping=HBNB_MYSQL_POOL_PRE_PING)
         if HBNB_ENV == "test":
             Base.metadata.drop_all(self.__engine)
+        self.__listeners = []
+        # dictionary - commits of this storage that changed each class
+        self.__generations = {}
+        # dictionary - (generation, expiry, fingerprint) by class name
+        self.__fingerprints = {}
+        # float - seconds a fingerprint is reused while this storage does
+        # not change its class, so that changes committed by others show
+        self.__fingerprint_ttl = float(getenv('HBNB_MYSQL_FINGERPRINT_TTL',
+                                              '') or 1)
 
-    def all(self, cls=None):
-        """query on the current database session"""
+    def all(self, cls=None, load=()):
+        """query on the current database session
+
+        load names the relationships to load along, dotted for nested
+        ones, each costs one more query instead of one per object"""
         new_dict = {}
         for clss in classes:
             if cls is None or cls is classes[clss] or cls is clss:
-                objs = self.__session.query(classes[clss]).all()
+                query = self.__session.query(classes[clss])
+                if load:
+                    query = query.options(*self.__loaders(classes[clss],
+                                                          load))
+                objs = query.all()
                 for obj in objs:
                     key = obj.__class__.__name__ + '.' + obj.id
                     new_dict[key] = obj
         return (new_dict)
 
+    @staticmethod
+    def __loaders(cls, load):
+        """returns the selectinload options of the relationship paths of
+        load starting on cls"""
+        options = []
+        for path in load:
+            names = path.split(".")
+            if not hasattr(cls, names[0]):
+                continue
+            option = None
+            owner = cls
+            for name in names:
+                attr = getattr(owner, name)
+                if option is None:
+                    option = selectinload(attr)
+                else:
+                    option = option.selectinload(attr)
+                owner = attr.property.mapper.class_
+            options.append(option)
+        return options
+
     def new(self, obj):
         """add the object to the current database session"""
         self.__session.add(obj)
@@ -68,22 +122,192 @@ class DBStorage:
         """reloads data from the database"""
         Base.metadata.create_all(self.__engine)
         sess_factory = sessionmaker(bind=self.__engine, expire_on_commit=False)
+        event.listen(sess_factory, "after_flush", self.__flushed)
+        event.listen(sess_factory, "after_commit", self.__committed)
+        event.listen(sess_factory, "after_rollback", self.__rolled_back)
         Session = scoped_session(sess_factory)
         self.__session = Session
 
+    def listen(self, callback):
+        """registers callback to be called with the keys of the objects
+        added, changed or deleted by each commit"""
+        self.__listeners.append(callback)
+
+    @staticmethod
+    def __flushed(session, flush_context):
+        """records the keys of the objects written by a flush, cascaded
+        deletes included, until the transaction ends"""
+        keys = session.info.setdefault("changed", set())
+        for obj in chain(session.new, session.dirty, session.deleted):
+            keys.add(obj.__class__.__name__ + "." + obj.id)
+
+    def __committed(self, session):
+        """bumps the generation of the classes written by the transaction
+        and notifies the listeners of their keys"""
+        keys = session.info.pop("changed", None)
+        if keys:
+            for name in {key.split(".")[0] for key in keys}:
+                self.__generations[name] = self.__generations.get(name,
+                                                                  0) + 1
+            for callback in self.__listeners:
+                callback(keys)
+
+    @staticmethod
+    def __rolled_back(session):
+        """forgets the keys written by a rolled back transaction"""
+        session.info.pop("changed", None)
+
+    def attach(self, obj):
+        """Return obj merged into the current session without loading it
+        again, or None if obj has unsaved changes"""
+        if obj._sa_instance_state.modified:
+            return None
+        return self.__session.merge(obj, load=False)
+
+    def filter(self, cls, **equals):
+        """Return a dictionary of the cls objects where object.attr is
+        equal to value for every attr=value of equals, a list, tuple or
+        set value matches any of its items
+
+        The filters are compiled into the WHERE clause of the query"""
+        if type(cls) is str:
+            cls = classes.get(cls)
+        query = self.__where(self.__session.query(cls), cls, equals)
+        return {cls.__name__ + "." + obj.id: obj for obj in query}
+
+    @staticmethod
+    def __where(query, cls, equals):
+        """returns query restricted to the rows matching equals"""
+        for attr, value in (equals or {}).items():
+            column = getattr(cls, attr)
+            if type(value) in (list, tuple, set, frozenset):
+                query = query.filter(column.in_(list(value)))
+            else:
+                query = query.filter(column == value)
+        return query
+
+    def search_places(self, states=(), cities=(), amenities=(), limit=None,
+                      after=None):
+        """Return the places located in one of the states or cities and
+        having every listed amenity
+
+        The filters are compiled into one SELECT joining cities and
+        place_amenity, the rows are streamed back in batches. With limit
+        or after, at most limit places following the cursor after are
+        returned in (created_at, id) order"""
+        from models.place import place_amenity
+        query = self.__session.query(Place)
+        if states or cities:
+            query = query.join(City, Place.city_id == City.id).filter(
+                or_(City.state_id.in_(states), City.id.in_(cities)))
+        amenities = set(amenities)
+        if amenities:
+            amenity_id = place_amenity.c.amenity_id
+            query = query.join(place_amenity,
+                               place_amenity.c.place_id == Place.id)
+            query = query.filter(amenity_id.in_(amenities))
+            query = query.group_by(Place.id).having(
+                func.count(func.distinct(amenity_id)) == len(amenities))
+        if limit is not None or after is not None:
+            if after is not None:
+                created_at, id = cursor.decode(after)
+                query = query.filter(or_(
+                    Place.created_at > created_at,
+                    and_(Place.created_at == created_at, Place.id > id)))
+            query = query.order_by(Place.created_at, Place.id)
+            if limit is not None:
+                return query.limit(limit).all()
+        return query.execution_options(stream_results=True).yield_per(1000)
+
+    def page(self, cls, filters=None, limit=None, after=None):
+        """Return the list of at most limit cls objects matching filters,
+        ordered by (created_at, id) and following the cursor after, along
+        with the cursor of the next page or None on the last page"""
+        if type(cls) is str:
+            cls = classes.get(cls)
+        query = self.__where(self.__session.query(cls), cls, filters)
+        if after:
+            created_at, id = cursor.decode(after)
+            query = query.filter(or_(
+                cls.created_at > created_at,
+                and_(cls.created_at == created_at, cls.id > id)))
+        query = query.order_by(cls.created_at, cls.id)
+        if limit is None:
+            return query.all(), None
+        objs = query.limit(limit + 1).all()
+        if len(objs) > limit:
+            return objs[:limit], cursor.encode(objs[limit - 1])
+        return objs, None
+
+    def iterate(self, cls, filters=None):
+        """Return an iterator over the cls objects matching filters,
+        ordered by (created_at, id)
+
+        The rows are read through a server side cursor and loaded in
+        batches, so the result set is never held in memory"""
+        if type(cls) is str:
+            cls = classes.get(cls)
+        query = self.__where(self.__session.query(cls), cls, filters)
+        query = query.order_by(cls.created_at, cls.id)
+        return iter(query.execution_options(stream_results=True)
+                    .yield_per(1000))
+
     def close(self):
         """call remove() method on the private session attribute"""
         self.__session.remove()
 
+    def pool_stats(self):
+        """Return the metrics of the connection pool"""
+        return self.__engine.pool.stats()
+
     def get(self, cls, id):
-        """Get cls object by id"""
+        """Get cls object by id using a primary key lookup"""
+        if type(cls) is str:
+            cls = classes.get(cls)
         if cls in classes.values() and id and type(id) == str:
-            cls_objects = self.all(cls)
-            for k, v in cls_objects.items():
-                if k.split(".")[1] == id:
-                    return v
+            return self.__session.query(cls).get(id)
         return None
 
     def count(self, cls=None):
-        """Return number of cls objects in storage"""
-        return len(self.all(cls))
+        """Return number of cls objects in storage using SELECT COUNT"""
+        if cls is None:
+            return sum(self.counts().values())
+        if type(cls) is str:
+            cls = classes.get(cls)
+        if cls not in classes.values():
+            return 0
+        return self.__session.query(func.count(cls.id)).scalar()
+
+    def counts(self):
+        """Return the number of objects of every class in one query"""
+        subqueries = [self.__session.query(func.count(clss.id)).label(name)
+                      for name, clss in classes.items()]
+        row = self.__session.query(*subqueries).one()
+        return dict(zip(classes, row))
+
+    def fingerprint(self, cls):
+        """Return the number of cls objects, the XOR of the CRC32 of their
+        id and updated_at, and the latest updated_at, in one query
+
+        The query scans the table, its result is reused until a commit of
+        this storage changes the class or HBNB_MYSQL_FINGERPRINT_TTL
+        seconds pass, 0 to keep it until such a commit"""
+        if type(cls) is str:
+            cls = classes.get(cls)
+        name = cls.__name__
+        generation = self.__generations.get(name, 0)
+        kept = self.__fingerprints.get(name)
+        if kept is not None and kept[0] == generation and (
+                not self.__fingerprint_ttl or time.monotonic() < kept[1]):
+            return kept[2]
+        checksum = func.bit_xor(func.crc32(func.concat(cls.id,
+                                                       cls.updated_at)))
+        count, checksum, updated_at = self.__session.query(
+            func.count(cls.id), checksum, func.max(cls.updated_at)).one()
+        fingerprint = (count, int(checksum or 0), updated_at)
+        # a commit made during the query bumped the generation, the
+        # fingerprint kept under the older one is not reused
+        self.__fingerprints[name] = (
+            generation, time.monotonic() + self.__fingerprint_ttl,
+            fingerprint)
+        return fingerprint
@@ -3,18 +3,39 @@
 Contains the FileStorage class
 """
 
-import json
+import atexit
+import io
+import logging
+from bisect import bisect_left, bisect_right, insort
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from itertools import chain
 import models
+import os
+import resource
+import signal
+import sys
+import threading
+import time
+import zlib
 from models.amenity import Amenity
 from models.base_model import BaseModel
 from models.city import City
+from models.engine import cursor, search, serializer
+from models.engine.locks import RWLock
 from models.place import Place
 from models.review import Review
 from models.state import State
 from models.user import User
+from os import getenv
 
 classes = {"Amenity": Amenity, "BaseModel": BaseModel, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
+# attributes holding the id, or list of ids, of related objects
+relations = {"City": ("state_id",),
+             "Place": ("city_id", "user_id", "amenity_ids"),
+             "Review": ("place_id", "user_id")}
+logger = logging.getLogger(__name__)
 
 
 class FileStorage:
@@ -22,69 +43,1001 @@ class FileStorage:
 
     # string - path to the JSON file
     __file_path = "file.json"
+    # boolean - keep one snapshot file per class instead of __file_path
+    __shards = getenv("HBNB_FILE_SHARDS") == "1"
+    # set - classes whose shard must be rewritten by the next save even if
+    # none of their objects changed
+    __stale = set()
+    # boolean - append changed objects to <__file_path>.journal on save
+    __journal = getenv("HBNB_FILE_JOURNAL") == "1"
+    # integer - journal entries after which the snapshot is compacted
+    __journal_max = int(getenv("HBNB_FILE_JOURNAL_MAX") or 1000)
+    # integer - entries appended to the journal since the last compaction
+    __journal_size = 0
+    # lock - serializes journal writes and compactions
+    __journal_lock = threading.Lock()
+    # lock - held by the running compaction, from the rotation of the
+    # journal to the removal of the rotated one
+    __compact_lock = threading.Lock()
+    # float - seconds a background thread waits to group saves into one
+    # flush, 0 to flush on every save
+    __flush_interval = float(getenv("HBNB_FILE_FLUSH_INTERVAL") or 0)
+    # event - set by save when a flush is due
+    __pending = threading.Event()
+    # thread - the background flusher, started by the first deferred save
+    __flusher = None
+    # lock - guards the start of the flusher
+    __flusher_lock = threading.Lock()
+    # boolean - pending saves are flushed when the process exits
+    __exit_hooked = False
+    # lock - serializes flushes, taken before __journal_lock
+    __flush_lock = threading.Lock()
+    # reader/writer lock - guards the objects and indexes, taken after
+    # __journal_lock when both are needed
+    __lock = RWLock()
+    # tuple - (inode, size, mtime) of the snapshot, or a tuple of those of
+    # the shards, and of the rotated journal as last read or written by
+    # this storage, None when missing
+    __stamps = (None, None)
+    # tuple - inode of the journal and bytes of it read or written so far
+    __journal_at = (None, 0)
+    # boolean - keep reloaded objects as dictionaries until first accessed
+    __lazy = getenv("HBNB_FILE_LAZY") == "1"
     # dictionary - empty but will store all objects by <class name>.id
     __objects = {}
+    # dictionary - the same objects partitioned by <class name>
+    __by_class = {}
+    # dictionary - objects by (<class name>, attribute) then related id
+    __related = {}
+    # dictionary - the related ids each object was filed under, as a tuple
+    # ordered like relations[<class name>]
+    __related_ids = {}
+    # dictionary - sorted (created_at, id) pairs by <class name>, built by
+    # the first page() of the class
+    __sorted = {}
+    # dictionary - CRC32 of the id and updated_at of each object by
+    # <class name> then key, built by the first fingerprint() of the class
+    __marks = {}
+    # dictionary - [XOR of the marks, latest updated_at] by <class name>
+    __fingerprints = {}
+    # dictionary - dictionaries of the objects not hydrated yet, by class
+    __raw = {}
+    # dictionary - objects changed since the last save, None when deleted
+    __dirty = {}
+    # dictionary - figures about the last reload
+    __load_stats = {}
+    # list - callables notified of the keys of the objects that changed
+    __listeners = []
 
-    def all(self, cls=None):
-        """returns the dictionary __objects"""
+    def __init__(self):
+        """hooks the flush of pending saves to the process exit when
+        saves are deferred"""
+        if self.__flush_interval:
+            self.__hook_exit()
+
+    def all(self, cls=None, load=()):
+        """returns a copy of the dictionary __objects, or of the objects
+        of cls
+
+        load is accepted for compatibility with DBStorage, relationships
+        are read from the related indexes"""
         if cls is not None:
-            new_dict = {}
-            for key, value in self.__objects.items():
-                if cls == value.__class__ or cls == value.__class__.__name__:
-                    new_dict[key] = value
-            return new_dict
-        return self.__objects
+            if type(cls) is not str:
+                cls = cls.__name__
+            self.__hydrated(cls)
+            with self.__lock.read():
+                return dict(self.__by_class.get(cls, {}))
+        for name in list(self.__raw):
+            self.__hydrated(name)
+        with self.__lock.read():
+            return dict(self.__objects)
 
     def new(self, obj):
         """sets in __objects the obj with key <obj class name>.id"""
         if obj is not None:
             key = obj.__class__.__name__ + "." + obj.id
-            self.__objects[key] = obj
+            with self.__lock.write():
+                self.__add(key, obj)
+                self.__dirty[key] = obj
+                self.__notify((key,))
 
-    def save(self):
-        """serializes __objects to the JSON file (path: __file_path)"""
-        json_objects = {}
-        for key in self.__objects:
-            json_objects[key] = self.__objects[key].to_dict()
-        with open(self.__file_path, 'w') as f:
-            json.dump(json_objects, f)
+    def __add(self, key, obj):
+        """stores obj under key in __objects and in the indexes"""
+        positions = self.__sorted.get(obj.__class__.__name__)
+        if positions is not None:
+            self.__unsort(positions, self.__objects.get(key))
+            insort(positions, (obj.created_at, obj.id))
+        self.__objects[key] = obj
+        self.__by_class.setdefault(obj.__class__.__name__, {})[key] = obj
+        self.__index(key, obj)
+        if obj.__class__.__name__ in self.__marks:
+            self.__mark(key, obj)
+        self.__dirty.pop(key, None)
+        if self.__raw:
+            self.__raw.get(obj.__class__.__name__, {}).pop(key, None)
 
-    def reload(self):
-        """deserializes the JSON file to __objects"""
+    def __put(self, key, value):
+        """stores the object described by the dictionary value under key
+
+        In lazy mode the dictionary itself is kept until first access"""
+        if self.__lazy:
+            self.__remove(key)
+            self.__dirty.pop(key, None)
+            self.__raw.setdefault(value["__class__"], {})[key] = value
+        else:
+            self.__add(key, classes[value["__class__"]](**value))
+
+    def __hydrate(self, key):
+        """turns the dictionary stored under key into an instance"""
+        value = self.__raw[key.split(".")[0]].pop(key)
+        obj = classes[value["__class__"]](**value)
+        self.__add(key, obj)
+        return obj
+
+    def __hydrate_class(self, name):
+        """turns every dictionary of the class name into an instance"""
+        for key in list(self.__raw.get(name, {})):
+            self.__hydrate(key)
+
+    def __hydrated(self, name):
+        """hydrates the class name if it has dictionaries left, must not
+        be called while reading
+
+        Reading sections only run storage code and read the attributes
+        stored on the objects, they never reach a hydration or a touch"""
+        if self.__raw.get(name):
+            with self.__lock.write():
+                self.__hydrate_class(name)
+
+    def __remove(self, key):
+        """removes the object stored under key from __objects and indexes"""
+        if self.__raw:
+            self.__raw.get(key.split(".")[0], {}).pop(key, None)
+        if key in self.__objects:
+            positions = self.__sorted.get(key.split(".")[0])
+            if positions is not None:
+                self.__unsort(positions, self.__objects[key])
+            del self.__objects[key]
+            self.__by_class[key.split(".")[0]].pop(key, None)
+            self.__unindex(key)
+            self.__unmark(key)
+
+    @staticmethod
+    def __unsort(positions, obj):
+        """removes the (created_at, id) pair of obj from positions"""
+        if obj is not None:
+            position = (obj.created_at, obj.id)
+            i = bisect_left(positions, position)
+            if i < len(positions) and positions[i] == position:
+                del positions[i]
+
+    def save(self, sync=False):
+        """serializes __objects to the JSON file (path: __file_path)
+
+        With a flush interval the save is left to the background flusher
+        and returns at once, unless sync is True"""
+        if not self.__flush_interval or sync:
+            self.flush()
+            return
+        self.__pending.set()
+        if self.__flusher is not None:
+            return
+        with self.__flusher_lock:
+            if self.__flusher is None:
+                FileStorage.__flusher = threading.Thread(
+                    target=self.__flush_loop, daemon=True)
+                FileStorage.__flusher.start()
+        self.__hook_exit()
+
+    def flush(self):
+        """writes the objects to the files now
+
+        In journal mode only the objects changed since the last save are
+        appended to the journal file"""
+        with self.__flush_lock:
+            self.__pending.clear()
+            if self.__journal:
+                self.__append_journal()
+                return
+            with self.__lock.write():
+                if self.__shards:
+                    names = self.__stale.union(
+                        key.split(".")[0] for key in self.__dirty)
+                else:
+                    names = (None,)
+                dirty, stale = dict(self.__dirty), self.__stale
+                self.__dirty.clear()
+                FileStorage.__stale = set()
+                records = {name: self.__records(name) for name in names}
+            try:
+                self.__write_snapshots(records, self.__remove_journal)
+            except BaseException:
+                self.__restore(dirty, stale)
+                raise
+
+    def __flush_loop(self):
+        """flushes at most once per interval while saves are made"""
+        while True:
+            self.__pending.wait()
+            time.sleep(self.__flush_interval)
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("cannot flush %s, retrying in %ss",
+                                 self.__file_path, self.__flush_interval)
+                self.__pending.set()
+
+    def __restore(self, dirty, stale):
+        """marks the objects of dirty and the classes of stale as changed
+        again after a failed flush, keeping the changes made since"""
+        with self.__lock.write():
+            for key, obj in dirty.items():
+                self.__dirty.setdefault(key, obj)
+            FileStorage.__stale = self.__stale.union(stale)
+
+    def __hook_exit(self):
+        """flushes the pending saves when the process exits, SIGTERM
+        included when nothing else handles it
+
+        The signal handler can only be set from the main thread, the
+        handler exits so that the flush runs once every lock is left"""
+        with self.__flusher_lock:
+            if self.__exit_hooked:
+                return
+            FileStorage.__exit_hooked = True
+            atexit.register(self.__flush_pending)
+        if (threading.current_thread() is threading.main_thread() and
+                signal.getsignal(signal.SIGTERM) == signal.SIG_DFL):
+            signal.signal(signal.SIGTERM,
+                          lambda signum, frame: sys.exit(128 + signum))
+
+    def __flush_pending(self):
+        """flushes the saves still waiting for the flusher"""
+        if self.__pending.is_set():
+            self.flush()
+
+    def __append_journal(self):
+        """appends the objects changed since the last save to the journal"""
+        lines = []
+        dirty = {}
+        with self.__lock.write():
+            while self.__dirty:
+                key, obj = self.__dirty.popitem()
+                dirty[key] = obj
+                value = obj.to_dict() if obj is not None else None
+                entry = {"key": key, "value": value}
+                lines.append(serializer.dumps(entry) + "\n")
+        if not lines:
+            return
+        with self.__journal_lock:
+            journal = self.__file_path + ".journal"
+            start = None
+            try:
+                with open(journal, 'a') as f:
+                    start = f.tell()
+                    f.writelines(reversed(lines))
+                    end = f.tell()
+                    inode = os.fstat(f.fileno()).st_ino
+            except BaseException:
+                if start is not None:
+                    # a torn entry would hide those appended after it
+                    os.truncate(journal, start)
+                self.__restore(dirty, ())
+                raise
+            known, offset = self.__journal_at
+            if offset == start and known in (inode, None):
+                # nothing was appended by others since the last read
+                FileStorage.__journal_at = (inode, end)
+            FileStorage.__journal_size += len(lines)
+            if self.__journal_size < self.__journal_max:
+                return
+            FileStorage.__journal_size = 0
+        threading.Thread(target=self.__compact_soon, daemon=True).start()
+
+    def __compact_soon(self):
+        """compacts unless a compaction is running, the entries appended
+        since it rotated the journal are left to the next one"""
+        if self.__compact_lock.acquire(blocking=False):
+            try:
+                self.__compact()
+            finally:
+                self.__compact_lock.release()
+
+    def compact(self):
+        """folds the journal into a new snapshot of __objects
+
+        The journal is first rotated to <__file_path>.journal.old so that
+        saves made while the snapshot is written go to a fresh journal.
+        Compactions run one at a time, an older one would otherwise
+        write its records over a newer snapshot"""
+        with self.__compact_lock:
+            self.__compact()
+
+    def __compact(self):
+        """rotates the journal and writes the snapshot, the compaction
+        lock must be held"""
+        with self.__journal_lock:
+            journal = self.__file_path + ".journal"
+            if not os.path.exists(journal):
+                pass
+            elif os.path.exists(journal + ".old"):
+                # an earlier compaction did not finish, keep its entries
+                with open(journal, 'r') as f:
+                    entries = f.read()
+                with open(journal + ".old", 'a') as f:
+                    f.write(entries)
+                os.remove(journal)
+            else:
+                os.replace(journal, journal + ".old")
+            FileStorage.__stamps = (self.__stamps[0],
+                                    self.__stamp(journal + ".old"))
+            FileStorage.__journal_at = (None, 0)
+            names = (None,)
+            if self.__shards:
+                names = list(classes)
+                FileStorage.__stale = set()
+            with self.__lock.read():
+                records = {name: self.__records(name) for name in names}
+        with self.__flush_lock:
+            try:
+                self.__write_snapshots(records, self.__remove_rotated)
+            except BaseException:
+                self.__restore({}, set(names) - {None})
+                raise
+
+    def __remove_rotated(self):
+        """deletes the rotated journal once a compaction supersedes it"""
+        journal = self.__file_path + ".journal.old"
+        if os.path.exists(journal):
+            os.remove(journal)
+
+    def __remove_journal(self):
+        """deletes the journal files once a full snapshot supersedes them"""
+        journal = self.__file_path + ".journal"
+        for path in (journal + ".old", journal):
+            if os.path.exists(path):
+                os.remove(path)
+        FileStorage.__journal_size = 0
+        FileStorage.__journal_at = (None, 0)
+
+    @staticmethod
+    def __stamp(path):
+        """returns the (inode, size, mtime) of path, None if missing"""
         try:
-            with open(self.__file_path, 'r') as f:
-                jo = json.load(f)
-            for key in jo:
-                self.__objects[key] = classes[jo[key]["__class__"]](**jo[key])
-        except Exception:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+    def __records(self, name=None):
+        """returns an iterator over the (key, dictionary) pairs of every
+        stored object of the class name, or of every class when None,
+        hydrated or not
+
+        The objects are listed when called, their dictionaries are built
+        while iterating"""
+        if name is None:
+            objects = list(self.__objects.items())
+            raw = [item for values in list(self.__raw.values())
+                   for item in list(values.items())]
+        else:
+            objects = list(self.__by_class.get(name, {}).items())
+            raw = list(self.__raw.get(name, {}).items())
+        return chain(((key, obj.to_dict()) for key, obj in objects), raw)
+
+    def __shard(self, name):
+        """returns the path of the snapshot of the class name, or of the
+        whole snapshot when None"""
+        if name is None:
+            return self.__file_path
+        root = os.path.splitext(self.__file_path)[0]
+        return "{}.{}.json".format(root, name)
+
+    def __snapshot_stamp(self):
+        """returns the stamp of the snapshot, or the stamps of the shards"""
+        if not self.__shards:
+            return self.__stamp(self.__file_path)
+        return tuple(self.__stamp(self.__shard(name)) for name in classes)
+
+    def __write_snapshots(self, records, superseded):
+        """writes the records of each class name, None for all of them,
+        to its snapshot file, then calls superseded to remove the journal
+        files they replace
+
+        In shard mode the whole snapshot is deleted once every shard was
+        written since it was loaded and is on disk. The files are renamed
+        and the stamps updated under the journal lock at once, close
+        would otherwise see files it does not know and reload them. The
+        temporary files are removed if a write fails"""
+        paths = [self.__shard(name) for name in records]
+        try:
+            for path, pairs in zip(paths, records.values()):
+                self.__write_snapshot(pairs, path)
+            with self.__journal_lock:
+                for path in paths:
+                    os.replace(path + ".tmp", path)
+                self.__sync_dir()
+                if (self.__shards and not self.__stale and
+                        all(os.path.isfile(self.__shard(name))
+                            for name in classes)):
+                    for path in (self.__file_path,
+                                 self.__file_path + ".sum"):
+                        if os.path.exists(path):
+                            os.remove(path)
+                superseded()
+                FileStorage.__stamps = (self.__snapshot_stamp(), None)
+        except BaseException:
+            for path in paths:
+                for tmp in (path + ".tmp", path + ".sum.tmp"):
+                    if os.path.isfile(tmp):
+                        os.remove(tmp)
+            raise
+
+    def __write_snapshot(self, records, path):
+        """writes the records to <path>.tmp and syncs it to disk, then
+        adds its checksum to <path>.sum
+
+        The caller renames the temporary file over the snapshot, the
+        checksum file keeps the one of the snapshot now at path too so
+        that either is accepted if the rename does not happen. Each
+        checksum is followed by the stamp of the file it was computed
+        on, which the rename keeps"""
+        with open(path + ".tmp", 'w') as f:
+            self.__dump(records, f)
+            f.flush()
+            os.fsync(f.fileno())
+        lines = ["{} {} {} {}".format(self.__checksum(path + ".tmp"),
+                                      *self.__stamp(path + ".tmp"))]
+        stamp = self.__stamp(path)
+        checksum = self.__recorded(path, stamp)
+        if checksum is not None:
+            lines.append("{} {} {} {}".format(checksum, *stamp))
+        with open(path + ".sum.tmp", 'w') as f:
+            f.write("\n".join(lines) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(path + ".sum.tmp", path + ".sum")
+
+    @staticmethod
+    def __checksum(path):
+        """returns the CRC32 of the file at path as 8 hexadecimal digits"""
+        checksum = 0
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                checksum = zlib.crc32(chunk, checksum)
+        return "{:08x}".format(checksum)
+
+    def __sync_dir(self):
+        """syncs the directory of the snapshot so that renames in it
+        survive a crash"""
+        fd = os.open(os.path.dirname(os.path.abspath(self.__file_path)),
+                     os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    @staticmethod
+    def __recorded(path, stamp):
+        """returns the checksum <path>.sum records for the snapshot at
+        path with stamp, None when it records none"""
+        if stamp is None:
+            return None
+        stamp = [str(value) for value in stamp]
+        try:
+            with open(path + ".sum", 'r') as f:
+                for line in f:
+                    fields = line.split()
+                    if fields[1:] == stamp:
+                        return fields[0]
+        except FileNotFoundError:
             pass
+        return None
+
+    def __verify(self, path, content=None, stamp=None):
+        """raises ValueError if the snapshot at path, or its content and
+        stamp when already read, does not match the checksum recorded
+        for it
+
+        A snapshot replaced or edited since this storage wrote it, by
+        hand or by another writer, has no checksum recorded under its
+        stamp and is not checked"""
+        if stamp is None:
+            stamp = self.__stamp(path)
+        checksum = self.__recorded(path, stamp)
+        if checksum is None:
+            return
+        if content is None:
+            actual = self.__checksum(path)
+        else:
+            actual = "{:08x}".format(zlib.crc32(content))
+        if actual != checksum:
+            raise ValueError("the file does not match its checksum")
+
+    def __set_aside(self, path, error):
+        """moves the unreadable snapshot at path and its checksum file
+        aside so that the storage goes on without its objects"""
+        aside = "{}.corrupt-{}".format(path, time.strftime("%Y%m%d%H%M%S"))
+        os.replace(path, aside)
+        if os.path.exists(path + ".sum"):
+            os.replace(path + ".sum", aside + ".sum")
+        FileStorage.__stamps = (self.__snapshot_stamp(), self.__stamps[1])
+        logger.warning("cannot reload %s: %s, moved it to %s and went on "
+                       "without its objects", path, error, aside)
+
+    @staticmethod
+    def __dump(records, f):
+        """writes the (key, dictionary) pairs to f as a JSON object
+
+        Each object goes on its own line so that __load can build the
+        instances one record at a time"""
+        f.write("{")
+        separator = "\n"
+        for key, value in records:
+            f.write(separator + serializer.dumps(key) + ": " +
+                    serializer.dumps(value))
+            separator = ",\n"
+        f.write("\n}\n")
+
+    def reload(self):
+        """deserializes the JSON file to __objects then replays the journal
+
+        A snapshot not matching its checksum or not parsing is moved aside
+        with a warning and its objects are left out"""
+        with self.__lock.write():
+            start = time.time()
+            loaded = 0
+            self.__sorted.clear()
+            self.__marks.clear()
+            self.__fingerprints.clear()
+            journal = self.__file_path + ".journal"
+            FileStorage.__stamps = (self.__snapshot_stamp(),
+                                    self.__stamp(journal + ".old"))
+            FileStorage.__journal_at = (None, 0)
+            if self.__shards:
+                loaded = self.__load_shards()
+            else:
+                try:
+                    self.__verify(self.__file_path)
+                    with open(self.__file_path, 'r') as f:
+                        loaded = self.__load(f)
+                except FileNotFoundError:
+                    pass
+                except ValueError as e:
+                    self.__set_aside(self.__file_path, e)
+            for path in (journal + ".old", journal):
+                try:
+                    with open(path, 'rb') as f:
+                        keys, offset = self.__replay(f)
+                        loaded += len(keys)
+                        if path == journal:
+                            inode = os.fstat(f.fileno()).st_ino
+                            FileStorage.__journal_at = (inode, offset)
+                except FileNotFoundError:
+                    pass
+            seconds = time.time() - start
+            self.__load_stats.update({
+                "objects": loaded,
+                "seconds": seconds,
+                "objects_per_sec": loaded / seconds if seconds else 0.0,
+                "peak_rss_kb":
+                    resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            })
+            self.__notify(None)
+
+    def __load(self, f):
+        """builds the objects of the snapshot file f, return their number
+
+        The whole file is parsed before any object is stored so that a
+        file failing to parse leaves none of its objects behind. Each
+        dictionary is dropped once its object is built"""
+        pairs = list(self.__parse(f))
+        loaded = len(pairs)
+        pairs.reverse()
+        while pairs:
+            self.__put(*pairs.pop())
+        return loaded
+
+    @staticmethod
+    def __parse(f):
+        """yields the (key, dictionary) pairs of the snapshot file f
+
+        Snapshots written by __dump are read line by line, anything else
+        is parsed as a whole"""
+        if f.readline().strip() != "{":
+            f.seek(0)
+            yield from serializer.loads(f.read()).items()
+            return
+        for line in f:
+            line = line.strip().rstrip(",")
+            if line and line != "}":
+                yield from serializer.loads("{" + line + "}").items()
+
+    def __load_shards(self):
+        """builds the objects of the whole snapshot then of the shards,
+        return their number
+
+        The files are read and verified in parallel, then parsed in
+        order by this thread as parsing holds the interpreter lock. A
+        whole snapshot left from before shards were enabled marks every
+        class stale so that the next save writes all the shards"""
+        paths = [self.__file_path] + [self.__shard(name) for name in classes]
+        with ThreadPoolExecutor() as pool:
+            snapshots = list(pool.map(self.__read, paths))
+        if snapshots[0] is not None:
+            FileStorage.__stale = set(classes)
+        loaded = 0
+        for path, snapshot in zip(paths, snapshots):
+            if snapshot is None:
+                continue
+            try:
+                loaded += self.__load(io.StringIO(snapshot))
+            except ValueError as e:
+                self.__set_aside(path, e)
+        return loaded
+
+    def __read(self, path):
+        """returns the verified content of the snapshot at path, None when
+        it does not exist or was set aside"""
+        try:
+            with open(path, 'rb') as f:
+                content = f.read()
+                stat = os.fstat(f.fileno())
+        except FileNotFoundError:
+            return None
+        try:
+            self.__verify(path, content,
+                          (stat.st_ino, stat.st_size, stat.st_mtime_ns))
+            return content.decode("utf-8")
+        except ValueError as e:
+            self.__set_aside(path, e)
+            return None
+
+    def load_stats(self):
+        """Return the number of objects, duration, objects per second and
+        peak resident memory in kilobytes of the last reload"""
+        return dict(self.__load_stats)
+
+    def lock_stats(self):
+        """Return the acquisitions, wait and hold seconds of the object
+        lock by mode"""
+        return self.__lock.stats()
+
+    def __replay(self, f):
+        """applies the journal entries read from the binary file f, return
+        the keys they changed and the number of bytes read"""
+        keys = []
+        offset = 0
+        for line in f:
+            try:
+                if not line.endswith(b"\n"):
+                    raise ValueError("unterminated entry")
+                entry = serializer.loads(line)
+            except ValueError:
+                # torn write at the end of the journal
+                break
+            offset += len(line)
+            key, value = entry["key"], entry["value"]
+            keys.append(key)
+            if value is None:
+                self.__remove(key)
+                self.__dirty.pop(key, None)
+            else:
+                self.__put(key, value)
+        return keys, offset
 
     def delete(self, obj=None):
         """delete obj from __objects if it’s inside"""
         if obj is not None:
             key = obj.__class__.__name__ + '.' + obj.id
-            if key in self.__objects:
-                del self.__objects[key]
+            with self.__lock.write():
+                if key in self.__objects:
+                    self.__remove(key)
+                    self.__dirty[key] = None
+                    self.__notify((key,))
+
+    def __index(self, key, obj):
+        """files obj under the ids of the objects it is related to
+
+        The ids are interned so that all the children of an object share
+        one copy of its id instead of one string each"""
+        self.__unindex(key)
+        name = obj.__class__.__name__
+        if name not in relations:
+            return
+        ids = []
+        for attr in relations[name]:
+            value = getattr(obj, attr, None)
+            if type(value) is list:
+                value = tuple(value)
+            elif type(value) is str and value:
+                value = sys.intern(value)
+                obj.__dict__[attr] = value
+            index = self.__related.setdefault((name, attr), {})
+            for related_id in self.__ids(value):
+                index.setdefault(related_id, {})[key] = obj
+            ids.append(value)
+        self.__related_ids[key] = tuple(ids)
+
+    @staticmethod
+    def __ids(value):
+        """returns the related ids held by an indexed attribute value"""
+        if type(value) is tuple:
+            return value
+        return (value,) if value else ()
+
+    def __unindex(self, key):
+        """removes the object stored under key from the related indexes"""
+        ids = self.__related_ids.pop(key, None)
+        if ids is None:
+            return
+        name = key.split(".")[0]
+        for attr, value in zip(relations[name], ids):
+            index = self.__related[(name, attr)]
+            for related_id in self.__ids(value):
+                children = index.get(related_id)
+                if children is not None:
+                    children.pop(key, None)
+                    if not children:
+                        del index[related_id]
+
+    def touch(self, obj, attr):
+        """marks obj as changed after obj.attr has been assigned"""
+        key = obj.__class__.__name__ + "." + obj.__dict__.get("id", "")
+        if self.__objects.get(key) is not obj:
+            return
+        name = obj.__class__.__name__
+        with self.__lock.write():
+            self.__dirty[key] = obj
+            if attr == "created_at":
+                self.__sorted.pop(name, None)
+            if attr in relations.get(name, ()):
+                self.__index(key, obj)
+            if attr == "updated_at" and name in self.__marks:
+                self.__mark(key, obj)
+            self.__notify((key,))
+
+    def listen(self, callback):
+        """registers callback to be called with the keys of the objects
+        that are added, changed or deleted, or with None when every
+        object may have changed"""
+        self.__listeners.append(callback)
+
+    def __notify(self, keys):
+        """calls the registered listeners with keys"""
+        for callback in self.__listeners:
+            callback(keys)
+
+    def filter(self, cls, **equals):
+        """Return a dictionary of the cls objects where object.attr is
+        equal to value for every attr=value of equals
+
+        A list, tuple or set value matches any of its items. Filters on
+        related ids are answered from the related indexes, the others
+        are checked on the objects the indexes returned"""
+        if type(cls) is not str:
+            cls = cls.__name__
+        self.__hydrated(cls)
+        with self.__lock.read():
+            objs, equals = self.__candidates(cls, equals)
+            if objs is None:
+                objs = self.__by_class.get(cls, {}).values()
+            return {cls + "." + obj.id: obj for obj in objs
+                    if self.__matches(obj, equals)}
+
+    def __candidates(self, cls, equals):
+        """Return the cls objects that may match equals, read from the
+        smallest matching related index, along with the filters that are
+        left to check on them
+
+        The objects are None when no filter is on a related id. The class
+        must be hydrated and the lock held for reading. Filters listing
+        strings are left as sets so that each object is checked in
+        constant time"""
+        equals = {attr: frozenset(value) if type(value) in (list, tuple) and
+                  all(type(item) is str for item in value) else value
+                  for attr, value in equals.items()}
+        best = None
+        for attr in relations.get(cls, ()):
+            values = self.__values(equals.get(attr))
+            if not all(type(value) is str and value for value in values):
+                continue
+            index = self.__related.get((cls, attr), {})
+            objs = {}
+            for value in values:
+                objs.update(index.get(value, {}))
+            if best is None or len(objs) < len(best[1]):
+                best = (attr, objs)
+        if best is None:
+            return None, equals
+        del equals[best[0]]
+        return best[1].values(), equals
+
+    @staticmethod
+    def __values(value):
+        """returns the values accepted by a filter value"""
+        if type(value) in (list, tuple, set, frozenset):
+            return value
+        return (value,)
+
+    @classmethod
+    def __matches(cls, obj, equals):
+        """returns True if obj passes every filter of equals, a list
+        attribute passes when it holds one of the values
+
+        Only the attributes stored on obj or its class are compared,
+        properties would run model code while the lock is held"""
+        for attr, value in equals.items():
+            actual = obj.__dict__.get(attr, getattr(type(obj), attr, None))
+            if type(actual) is property:
+                actual = None
+            values = cls.__values(value)
+            if type(actual) in (list, tuple):
+                if not any(item in actual for item in values):
+                    return False
+            elif actual not in values:
+                return False
+        return True
+
+    def search_places(self, states=(), cities=(), amenities=(), limit=None,
+                      after=None):
+        """Return the places located in one of the states or cities and
+        having every listed amenity
+
+        With limit or after, at most limit places following the cursor
+        after are returned in (created_at, id) order"""
+        return search.search_places(self, states, cities, amenities, limit,
+                                    after)
+
+    def page(self, cls, filters=None, limit=None, after=None):
+        """Return the list of at most limit cls objects matching filters,
+        ordered by (created_at, id) and following the cursor after, along
+        with the cursor of the next page or None on the last page"""
+        objs = []
+        self.__hydrated(cls if type(cls) is str else cls.__name__)
+        with self.__lock.read():
+            for obj in self.__ordered(cls, filters, after):
+                if limit is not None and len(objs) == limit:
+                    return objs, cursor.encode(objs[-1])
+                objs.append(obj)
+        return objs, None
+
+    def iterate(self, cls, filters=None):
+        """Return an iterator over the cls objects matching filters,
+        ordered by (created_at, id)
+
+        The order is taken when the iteration starts, objects deleted
+        meanwhile are skipped"""
+        self.__hydrated(cls if type(cls) is str else cls.__name__)
+        return self.__ordered(cls, filters, None, snapshot=True)
+
+    def __ordered(self, cls, filters, after, snapshot=False):
+        """Yield the cls objects matching filters following the cursor
+        after, in (created_at, id) order
+
+        The filters are those of filter, related ids are read from the
+        related indexes and the rest is checked in order. With snapshot
+        the sorted positions are copied so that objects created while
+        iterating cannot shift them, otherwise the caller must hold the
+        lock for reading until done. The class must be hydrated"""
+        if type(cls) is not str:
+            cls = cls.__name__
+        with self.__lock.read():
+            objs, filters = self.__candidates(cls, filters or {})
+            if objs is not None:
+                positions = sorted((obj.created_at, obj.id) for obj in objs)
+            else:
+                if cls not in self.__sorted:
+                    self.__sorted[cls] = sorted(
+                        (obj.created_at, obj.id)
+                        for obj in self.__by_class.get(cls, {}).values())
+                positions = self.__sorted[cls]
+            start = 0
+            if after:
+                start = bisect_right(positions, cursor.decode(after))
+            if snapshot:
+                positions = positions[start:]
+                start = 0
+        partition = self.__by_class.get(cls, {})
+        for i in range(start, len(positions)):
+            obj = partition.get(cls + "." + positions[i][1])
+            if obj is not None and self.__matches(obj, filters):
+                yield obj
 
     def close(self):
-        """call reload() method for deserializing the JSON file to objects"""
-        self.reload()
+        """reloads what changed in the files since this storage last read
+        or wrote them
+
+        Nothing is read when they are unchanged, a journal that only grew
+        is replayed from where it was left, anything else is reloaded"""
+        journal = self.__file_path + ".journal"
+        with self.__journal_lock:
+            stamps = (self.__snapshot_stamp(),
+                      self.__stamp(journal + ".old"))
+            current = self.__stamp(journal)
+            inode, offset = self.__journal_at
+            if stamps == self.__stamps:
+                if current is None:
+                    if inode is None:
+                        return
+                elif inode in (None, current[0]) and current[1] >= offset:
+                    if current[1] > offset:
+                        with open(journal, 'rb') as f, self.__lock.write():
+                            f.seek(offset)
+                            keys, read = self.__replay(f)
+                        FileStorage.__journal_at = (current[0],
+                                                    offset + read)
+                        self.__notify(keys)
+                    return
+        if not self.__pending.is_set():
+            # a pending flush overwrites the files with these objects
+            self.reload()
 
     def get(self, cls, id):
         """Get cls object where object.id==id"""
-        if cls in classes.values():
-            cls_objects = models.storage.all(cls)
-            for obj in cls_objects:
-                if obj.id == id:
-                    return obj
+        if type(cls) is str:
+            cls = classes.get(cls)
+        if cls in classes.values() and type(id) is str:
+            key = cls.__name__ + "." + id
+            obj = self.__objects.get(key)
+            if obj is None and key in self.__raw.get(cls.__name__, {}):
+                with self.__lock.write():
+                    obj = self.__objects.get(key)
+                    if obj is None and key in self.__raw.get(cls.__name__,
+                                                             {}):
+                        obj = self.__hydrate(key)
+            return obj
         return None
 
     def count(self, cls=None):
         """Return number of objects where object.class==cls"""
-        len_objects = 0
         if cls is None:
-            for _class in classes.values():
-                len_objects += len(models.storage.all(_class))
-        else:
-            len_objects = len(models.storage.all(cls))
-        return len_objects
+            return len(self.__objects) + sum(map(len, self.__raw.values()))
+        if type(cls) is not str:
+            cls = cls.__name__
+        return len(self.__by_class.get(cls, {})) + len(self.__raw.get(cls, {}))
+
+    def counts(self):
+        """Return the number of objects of every class"""
+        return {name: self.count(name) for name in classes}
+
+    def fingerprint(self, cls):
+        """Return the number of cls objects, the XOR of the CRC32 of their
+        id and updated_at, and the latest updated_at seen
+
+        The marks of a class are computed once then kept up to date by
+        new, delete and updated_at assignments"""
+        if type(cls) is not str:
+            cls = cls.__name__
+        self.__hydrated(cls)
+        if cls not in self.__marks:
+            with self.__lock.write():
+                if cls not in self.__marks:
+                    self.__fingerprints[cls] = [0, None]
+                    self.__marks[cls] = {}
+                    for key, obj in self.__by_class.get(cls, {}).items():
+                        self.__mark(key, obj)
+        with self.__lock.read():
+            checksum, updated_at = self.__fingerprints[cls]
+            return len(self.__marks[cls]), checksum, updated_at
+
+    def __mark(self, key, obj):
+        """replaces the mark of the object stored under key by the one of
+        obj in the fingerprint of its class"""
+        name = obj.__class__.__name__
+        marks = self.__marks[name]
+        fingerprint = self.__fingerprints[name]
+        updated_at = getattr(obj, "updated_at", None)
+        mark = zlib.crc32((obj.id + str(updated_at)).encode("utf-8"))
+        fingerprint[0] ^= marks.pop(key, 0) ^ mark
+        marks[key] = mark
+        if isinstance(updated_at, datetime) and (
+                fingerprint[1] is None or updated_at > fingerprint[1]):
+            fingerprint[1] = updated_at
+
+    def __unmark(self, key):
+        """removes the mark of the object stored under key"""
+        name = key.split(".")[0]
+        mark = self.__marks.get(name, {}).pop(key, None)
+        if mark is not None:
+            self.__fingerprints[name][0] ^= mark
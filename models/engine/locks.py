@@ -0,0 +1,112 @@
+#!/usr/bin/python3
+"""
+Contains the class RWLock, the reader/writer lock of FileStorage
+
+Any number of threads may read at once, a writer waits for the readers
+to leave and holds the lock alone. Waiting writers go first so that a
+stream of readers cannot starve them. Both sides are reentrant for the
+thread holding them, and a writer may also read.
+"""
+
+from contextlib import contextmanager
+import threading
+import time
+
+
+class RWLock:
+    """reader/writer lock keeping wait and hold times"""
+
+    def __init__(self):
+        """Instantiate an unlocked RWLock with zeroed metrics"""
+        # condition - guards every attribute below
+        self.__cond = threading.Condition(threading.Lock())
+        # integer - threads holding the lock for reading
+        self.__readers = 0
+        # integer - threads waiting to write
+        self.__waiting = 0
+        # integer - ident of the thread holding the lock for writing
+        self.__writer = None
+        # thread local - read and write depth of the current thread
+        self.__local = threading.local()
+        # dictionary - acquisitions, wait and hold seconds by mode
+        self.__metrics = {mode: {"acquired": 0, "wait_seconds": 0.0,
+                                 "max_wait_seconds": 0.0,
+                                 "hold_seconds": 0.0,
+                                 "max_hold_seconds": 0.0}
+                          for mode in ("read", "write")}
+
+    @contextmanager
+    def read(self):
+        """Hold the lock for reading during the with block"""
+        depth = getattr(self.__local, "depth", 0)
+        if depth or self.__writer == threading.get_ident():
+            self.__local.depth = depth + 1
+            try:
+                yield
+            finally:
+                self.__local.depth = depth
+            return
+        start = time.perf_counter()
+        with self.__cond:
+            while self.__writer is not None or self.__waiting:
+                self.__cond.wait()
+            self.__readers += 1
+        acquired = time.perf_counter()
+        self.__local.depth = 1
+        try:
+            yield
+        finally:
+            self.__local.depth = 0
+            with self.__cond:
+                self.__readers -= 1
+                if not self.__readers:
+                    self.__cond.notify_all()
+                self.__record("read", start, acquired)
+
+    @contextmanager
+    def write(self):
+        """Hold the lock alone during the with block
+
+        Raises RuntimeError if the thread is reading, a reader cannot
+        become a writer without deadlocking"""
+        ident = threading.get_ident()
+        if self.__writer == ident:
+            yield
+            return
+        if getattr(self.__local, "depth", 0):
+            raise RuntimeError("cannot write while reading")
+        start = time.perf_counter()
+        with self.__cond:
+            self.__waiting += 1
+            while self.__writer is not None or self.__readers:
+                self.__cond.wait()
+            self.__waiting -= 1
+            self.__writer = ident
+        acquired = time.perf_counter()
+        try:
+            yield
+        finally:
+            with self.__cond:
+                self.__writer = None
+                self.__cond.notify_all()
+                self.__record("write", start, acquired)
+
+    def __record(self, mode, start, acquired):
+        """adds an acquisition of mode to the metrics, the condition
+        must be held"""
+        metrics = self.__metrics[mode]
+        waited = acquired - start
+        held = time.perf_counter() - acquired
+        metrics["acquired"] += 1
+        metrics["wait_seconds"] += waited
+        metrics["hold_seconds"] += held
+        if waited > metrics["max_wait_seconds"]:
+            metrics["max_wait_seconds"] = waited
+        if held > metrics["max_hold_seconds"]:
+            metrics["max_hold_seconds"] = held
+
+    def stats(self):
+        """Return the acquisitions, wait and hold seconds of each mode"""
+        with self.__cond:
+            return {mode: dict(metrics)
+                    for mode, metrics in self.__metrics.items()}
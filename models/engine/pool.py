@@ -0,0 +1,86 @@
+#!/usr/bin/python3
+"""
+Contains the class MeteredPool, the connection pool of DBStorage
+
+A QueuePool counting checkouts, the connections it opens and those
+of them opened beyond pool_size, checkout timeouts, and the time spent
+waiting for a connection to be checked in. Overflow connections are
+closed when checked in, so their count is the connection churn of the
+pool.
+"""
+
+from sqlalchemy.exc import TimeoutError
+from sqlalchemy.pool import QueuePool
+import threading
+import time
+
+
+class MeteredPool(QueuePool):
+    """QueuePool keeping metrics about its checkouts"""
+
+    def __init__(self, *args, **kwargs):
+        """Instantiate a MeteredPool with zeroed metrics"""
+        super().__init__(*args, **kwargs)
+        # lock - guards the metrics
+        self.__lock = threading.Lock()
+        # dictionary - counters and wait times since the pool was created
+        self.__metrics = {"checkouts": 0, "connects": 0, "overflows": 0,
+                          "timeouts": 0, "wait_seconds": 0.0,
+                          "max_wait_seconds": 0.0}
+        # thread local - checkout depth and seconds spent opening
+        # connections during the checkout of the current thread
+        self.__local = threading.local()
+
+    def _do_get(self):
+        """Return a connection record checked out of the queue, timing
+        the wait for it without the time spent opening a connection
+
+        QueuePool._do_get calls itself again when it loses a race, the
+        inner calls are part of the same checkout"""
+        if getattr(self.__local, "depth", 0):
+            return super()._do_get()
+        self.__local.depth = 1
+        self.__local.connecting = 0.0
+        start = time.perf_counter()
+        try:
+            record = super()._do_get()
+        except TimeoutError:
+            self.__record("timeouts", time.perf_counter() - start)
+            raise
+        finally:
+            self.__local.depth = 0
+        waited = time.perf_counter() - start - self.__local.connecting
+        self.__record("checkouts", max(waited, 0.0))
+        return record
+
+    def _create_connection(self):
+        """Return a new connection record, counting it as an overflow
+        when it goes beyond pool_size"""
+        start = time.perf_counter()
+        record = super()._create_connection()
+        if getattr(self.__local, "depth", 0):
+            self.__local.connecting += time.perf_counter() - start
+        with self.__lock:
+            self.__metrics["connects"] += 1
+            if self.overflow() > 0:
+                self.__metrics["overflows"] += 1
+        return record
+
+    def __record(self, counter, waited):
+        """adds a checkout, or a timeout, that waited seconds to the
+        metrics"""
+        with self.__lock:
+            self.__metrics[counter] += 1
+            self.__metrics["wait_seconds"] += waited
+            if waited > self.__metrics["max_wait_seconds"]:
+                self.__metrics["max_wait_seconds"] = waited
+
+    def stats(self):
+        """Return the pool size, the connections checked out and in
+        overflow, and the metrics since the pool was created"""
+        with self.__lock:
+            metrics = dict(self.__metrics)
+        metrics.update({"size": self.size(),
+                        "checked_out": self.checkedout(),
+                        "overflow": max(self.overflow(), 0)})
+        return metrics
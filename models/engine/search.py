@@ -0,0 +1,46 @@
+#!/usr/bin/python3
+"""
+Contains the places_search engine of the file storage
+"""
+
+from heapq import nsmallest
+from models.engine import cursor
+
+
+def search_places(storage, states=(), cities=(), amenities=(), limit=None,
+                  after=None):
+    """Return the places located in one of the states or cities and
+    having every listed amenity
+
+    The location and the first amenity are filtered together, the
+    storage reads the smaller of the two from its related indexes and
+    checks the other on those places only. The other amenities are
+    then checked on the places left. With limit or after, at most limit
+    places following the cursor after are returned in (created_at, id)
+    order"""
+    equals = {}
+    if states or cities:
+        city_ids = set(cities)
+        city_ids.update(city.id for city in
+                        storage.filter("City", state_id=list(states)).values())
+        equals["city_id"] = list(city_ids)
+    amenities = list(dict.fromkeys(amenities))
+    if amenities:
+        equals["amenity_ids"] = amenities[0]
+    if not equals:
+        if limit is not None or after is not None:
+            return storage.page("Place", None, limit, after)[0]
+        return list(storage.all("Place").values())
+    places = [place for place in storage.filter("Place", **equals).values()
+              if all(amenity_id in place.amenity_ids
+                     for amenity_id in amenities[1:])]
+    if limit is None and after is None:
+        return places
+    if after is not None:
+        position = cursor.decode(after)
+        places = [place for place in places
+                  if (place.created_at, place.id) > position]
+    if limit is None:
+        limit = len(places)
+    return nsmallest(limit, places,
+                     key=lambda place: (place.created_at, place.id))
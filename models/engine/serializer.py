@@ -0,0 +1,75 @@
+#!/usr/bin/python3
+"""
+Contains the JSON serializer shared by the storage engines and the API
+
+orjson or ujson is used when installed, the json module otherwise. The
+HBNB_JSON_BACKEND environment variable forces one of "orjson", "ujson"
+or "json".
+"""
+
+import json
+from os import getenv
+
+backend = getenv("HBNB_JSON_BACKEND")
+if backend in (None, "orjson"):
+    try:
+        import orjson
+        backend = "orjson"
+    except ImportError:
+        pass
+if backend in (None, "ujson"):
+    try:
+        import ujson
+        backend = "ujson"
+    except ImportError:
+        pass
+if backend not in ("orjson", "ujson"):
+    backend = "json"
+
+
+def dumps(obj, sort_keys=False):
+    """returns the JSON document of obj as a string"""
+    try:
+        if backend == "orjson":
+            option = orjson.OPT_SORT_KEYS if sort_keys else 0
+            return orjson.dumps(obj, option=option).decode("utf-8")
+        if backend == "ujson":
+            return ujson.dumps(obj, sort_keys=sort_keys, ensure_ascii=False,
+                               escape_forward_slashes=False)
+    except TypeError:
+        # types the fast backends refuse, e.g. non string keys
+        pass
+    return json.dumps(obj, sort_keys=sort_keys)
+
+
+def loads(string):
+    """returns the object of the JSON document string"""
+    if backend == "orjson":
+        return orjson.loads(string)
+    if backend == "ujson":
+        return ujson.loads(string)
+    return json.loads(string)
+
+
+def iterdumps(objs, sort_keys=False, chunk_size=65536):
+    """yields the JSON array of the iterable objs in string chunks
+
+    The items are dumped one at a time and grouped into chunks of
+    about chunk_size characters, objs is consumed lazily"""
+    chunk = []
+    size = 0
+    separator = "["
+    for obj in objs:
+        item = dumps(obj, sort_keys=sort_keys)
+        chunk.append(separator)
+        chunk.append(item)
+        separator = ","
+        size += len(item) + 1
+        if size >= chunk_size:
+            yield "".join(chunk)
+            chunk = []
+            size = 0
+    if separator == "[":
+        chunk.append(separator)
+    chunk.append("]\n")
+    yield "".join(chunk)
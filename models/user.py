@@ -33,3 +33,17 @@ class User(BaseModel, Base):
         md5.update(password.encode('utf-8'))
         kwargs['password'] = md5.hexdigest()
         super().__init__(*args, **kwargs)
+
+    if models.storage_t != 'db':
+        @property
+        def places(self):
+            """getter for list of place instances owned by the user"""
+            from models.place import Place
+            return list(models.storage.filter(Place, user_id=self.id).values())
+
+        @property
+        def reviews(self):
+            """getter for list of review instances written by the user"""
+            from models.review import Review
+            reviews = models.storage.filter(Review, user_id=self.id)
+            return list(reviews.values())
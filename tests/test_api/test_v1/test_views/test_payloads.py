@@ -0,0 +1,132 @@
+#!/usr/bin/python3
+"""
+Contains the TestPayloadsDocs and TestPayloads classes
+"""
+
+from api.v1.app import app
+from api.v1.views import conditional, payloads
+import gzip
+import inspect
+import json
+import models
+from models.state import State
+import pep8
+import unittest
+
+
+class TestPayloadsDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the payload cache"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.payloads_f = inspect.getmembers(payloads, inspect.isfunction)
+
+    def test_pep8_conformance_payloads(self):
+        """Test that the payloads and conditional views conform to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/views/payloads.py',
+                                    'api/v1/views/conditional.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_payloads(self):
+        """Test tests/test_api/test_v1/test_views/test_payloads.py PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_api/test_v1/test_views/\
+test_payloads.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_payloads_module_docstring(self):
+        """Test for the payloads.py and conditional.py module docstrings"""
+        for module in (payloads, conditional):
+            self.assertIsNot(module.__doc__, None,
+                             "{} needs a docstring".format(module.__name__))
+
+    def test_payloads_func_docstrings(self):
+        """Test for the presence of docstrings in payloads functions"""
+        for func in self.payloads_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestPayloads(unittest.TestCase):
+    """Test the cached and compressed GET /api/v1/states responses"""
+    url = "/api/v1/states"
+
+    @classmethod
+    def setUpClass(cls):
+        """Create enough states for the list to be compressed"""
+        cls.client = app.test_client()
+        cls.states = [State(name="Hidden_Village_{:03d}".format(i))
+                      for i in range(30)]
+        for state in cls.states:
+            models.storage.new(state)
+
+    @classmethod
+    def tearDownClass(cls):
+        """Remove the states from the storage"""
+        for state in cls.states:
+            models.storage.delete(state)
+
+    def get(self, **headers):
+        """Return the response of GET /api/v1/states with headers"""
+        return self.client.get(self.url, headers=headers)
+
+    @staticmethod
+    def ids(body):
+        """Return the ids listed in the JSON body"""
+        return {obj["id"] for obj in json.loads(body)}
+
+    def test_compressed(self):
+        """Test a body over MIN_SIZE is sent compressed and varies on
+        Accept-Encoding"""
+        response = self.get(**{"Accept-Encoding": "gzip"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response.vary)
+        self.assertTrue(response.get_etag()[0].endswith("-gzip"))
+        body = gzip.decompress(response.data)
+        self.assertGreater(len(body), payloads.MIN_SIZE)
+        self.assertLessEqual({state.id for state in self.states},
+                             self.ids(body))
+        plain = self.get()
+        self.assertNotIn("Content-Encoding", plain.headers)
+        self.assertIn("Accept-Encoding", plain.vary)
+        self.assertEqual(plain.data, body)
+
+    def test_not_modified(self):
+        """Test If-None-Match answers 304, with or without the coding
+        suffix of the ETag"""
+        for headers in ({}, {"Accept-Encoding": "gzip"}):
+            tag = self.get(**headers).get_etag()[0]
+            headers["If-None-Match"] = '"{}"'.format(tag)
+            response = self.get(**headers)
+            self.assertEqual(response.status_code, 304)
+            self.assertEqual(response.data, b"")
+            self.assertEqual(response.get_etag()[0], tag)
+        tag = self.get().get_etag()[0]
+        response = self.get(**{"Accept-Encoding": "gzip",
+                               "If-None-Match": '"{}"'.format(tag)})
+        self.assertEqual(response.status_code, 304)
+
+    def test_rebuilt(self):
+        """Test a change of the class rebuilds the cached bytes"""
+        first = self.get()
+        tag = first.get_etag()[0]
+        state = State(name="Hidden_Village_New")
+        models.storage.new(state)
+        try:
+            response = self.get(**{"If-None-Match": '"{}"'.format(tag)})
+            self.assertEqual(response.status_code, 200)
+            self.assertNotEqual(response.get_etag()[0], tag)
+            self.assertIn(state.id, self.ids(response.data))
+            self.assertNotIn(state.id, self.ids(first.data))
+            self.assertEqual(payloads.payloads[self.url][0],
+                             response.get_etag()[0])
+        finally:
+            models.storage.delete(state)
+        self.assertNotIn(state.id, self.ids(self.get().data))
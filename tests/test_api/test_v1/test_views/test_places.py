@@ -0,0 +1,110 @@
+#!/usr/bin/python3
+"""
+Contains the TestPlacesDocs and TestPlacesSearch classes
+"""
+
+from api.v1.app import app
+from api.v1.views import pagination, places
+import inspect
+import models
+from models.city import City
+from models.place import Place
+from models.state import State
+import pep8
+import unittest
+
+
+class TestPlacesDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the places views"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.pagination_f = inspect.getmembers(pagination, inspect.isfunction)
+
+    def test_pep8_conformance_places(self):
+        """Test that the places and pagination views conform to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/views/places.py',
+                                    'api/v1/views/pagination.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_places(self):
+        """Test tests/test_api/test_v1/test_views/test_places.py PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_api/test_v1/test_views/\
+test_places.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_places_module_docstring(self):
+        """Test for the places.py module docstring"""
+        self.assertIsNot(places.__doc__, None,
+                         "places.py needs a docstring")
+
+    def test_pagination_func_docstrings(self):
+        """Test for the presence of docstrings in pagination functions"""
+        for func in self.pagination_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestPlacesSearch(unittest.TestCase):
+    """Test POST /api/v1/places_search"""
+    @classmethod
+    def setUpClass(cls):
+        """Create a state with a city and five places"""
+        cls.client = app.test_client()
+        cls.state = State(name="Leaf")
+        cls.city = City(name="Konoha", state_id=cls.state.id)
+        cls.places = [Place(name=str(i), city_id=cls.city.id, user_id="u")
+                      for i in range(5)]
+        cls.objs = [cls.state, cls.city] + cls.places
+        for obj in cls.objs:
+            models.storage.new(obj)
+        cls.places.sort(key=lambda place: (place.created_at, place.id))
+
+    @classmethod
+    def tearDownClass(cls):
+        """Remove the objects from the storage"""
+        for obj in cls.objs:
+            models.storage.delete(obj)
+
+    def search(self, query=""):
+        """Return the response of a search of the state"""
+        return self.client.post("/api/v1/places_search" + query,
+                                json={"states": [self.state.id]})
+
+    def test_pages(self):
+        """Test that limit and after page the places in order"""
+        ids = [place.id for place in self.places]
+        response = self.search("?limit=3")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([place["id"] for place in response.get_json()],
+                         ids[:3])
+        after = response.headers["X-Next-Cursor"]
+        response = self.search("?limit=3&after=" + after)
+        self.assertEqual([place["id"] for place in response.get_json()],
+                         ids[3:])
+        self.assertNotIn("X-Next-Cursor", response.headers)
+
+    def test_unpaged(self):
+        """Test that a search without limit lists every place"""
+        response = self.search()
+        self.assertCountEqual([place["id"] for place in response.get_json()],
+                              [place.id for place in self.places])
+
+    def test_bad_request(self):
+        """Test that invalid arguments and bodies answer 400"""
+        for query, error in (("?limit=0", "Invalid limit"),
+                             ("?limit=ten", "Invalid limit"),
+                             ("?after=%21", "Invalid cursor")):
+            response = self.search(query)
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(response.get_json(), {"error": error})
+        response = self.client.post("/api/v1/places_search", data="x")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.get_json(), {"error": "Not a JSON"})
@@ -136,6 +136,21 @@ class TestBaseModel(unittest.TestCase):
         self.assertEqual(new_d["created_at"], bm.created_at.strftime(t_format))
         self.assertEqual(new_d["updated_at"], bm.updated_at.strftime(t_format))
 
+    def test_time_codec(self):
+        """test format_time and parse_time match strftime and strptime"""
+        t_format = "%Y-%m-%dT%H:%M:%S.%f"
+        dates = [datetime(2017, 9, 28, 21, 5, 54, 119427),
+                 datetime(2017, 9, 28, 21, 5, 54),
+                 datetime(2024, 2, 29, 0, 0, 0, 1)]
+        for date in dates:
+            with self.subTest(date=date):
+                string = models.base_model.format_time(date)
+                self.assertEqual(string, date.strftime(t_format))
+                self.assertEqual(models.base_model.parse_time(string), date)
+        self.assertEqual(models.base_model.parse_time(
+            "2017-09-28T21:05:54.1194"), datetime(2017, 9, 28, 21, 5, 54,
+                                                  119400))
+
     def test_str(self):
         """test that the str method has the correct output"""
         inst = BaseModel()
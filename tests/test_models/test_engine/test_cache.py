@@ -0,0 +1,170 @@
+#!/usr/bin/python3
+"""
+Contains the TestCacheDocs and TestCache classes
+"""
+
+import inspect
+import models
+from models.engine import cache
+from models.engine.cache import Cache
+from models.engine.file_storage import FileStorage
+from models.state import State
+import pep8
+import threading
+import time
+import unittest
+
+
+class TestCacheDocs(unittest.TestCase):
+    """Tests to check the documentation and style of Cache class"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.cache_f = inspect.getmembers(Cache, inspect.isfunction)
+
+    def test_pep8_conformance_cache(self):
+        """Test that models/engine/cache.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/cache.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_cache(self):
+        """Test tests/test_models/test_engine/test_cache.py PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_cache.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_cache_module_docstring(self):
+        """Test for the cache.py module docstring"""
+        self.assertIsNot(cache.__doc__, None,
+                         "cache.py needs a docstring")
+        self.assertTrue(len(cache.__doc__) >= 1,
+                        "cache.py needs a docstring")
+
+    def test_cache_class_docstring(self):
+        """Test for the Cache class docstring"""
+        self.assertIsNot(Cache.__doc__, None,
+                         "Cache class needs a docstring")
+        self.assertTrue(len(Cache.__doc__) >= 1,
+                        "Cache class needs a docstring")
+
+    def test_cache_func_docstrings(self):
+        """Test for the presence of docstrings in Cache methods"""
+        for func in self.cache_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestCache(unittest.TestCase):
+    """Test the Cache class around the file storage"""
+    def setUp(self):
+        """Store a state behind a cache of two entries"""
+        self.storage = Cache(FileStorage(), size=2, ttl=0)
+        self.state = State(name="Fire")
+        self.storage.new(self.state)
+
+    def tearDown(self):
+        """Remove the state from the storage"""
+        self.storage.delete(self.state)
+
+    def test_get(self):
+        """Test that get counts misses then hits"""
+        before = self.storage.stats()
+        self.assertIs(self.storage.get(State, self.state.id), self.state)
+        self.assertIs(self.storage.get("State", self.state.id), self.state)
+        after = self.storage.stats()
+        self.assertEqual(after["misses"] - before["misses"], 1)
+        self.assertEqual(after["hits"] - before["hits"], 1)
+
+    def test_to_dict(self):
+        """Test that payloads are reused until the object changes"""
+        payload = self.storage.to_dict(self.state)
+        self.assertIs(self.storage.to_dict(self.state), payload)
+        self.state.name = "Water"
+        payload = self.storage.to_dict(self.state)
+        self.assertEqual(payload["name"], "Water")
+        self.assertIs(self.storage.to_dict(self.state), payload)
+
+    def test_to_dict_other_instance(self):
+        """Test that a payload is only served to the instance it was
+        built from"""
+        payload = self.storage.to_dict(self.state)
+        copy = State(**self.state.to_dict())
+        copy.name = "Earth"
+        self.assertEqual(self.storage.to_dict(copy)["name"], "Earth")
+        self.assertIs(self.storage.get(State, self.state.id), self.state)
+        self.assertEqual(self.storage.to_dict(self.state)["name"], "Fire")
+        self.assertIsNot(self.storage.to_dict(self.state), payload)
+
+    def test_get_hit(self):
+        """Test that a hit is served without reading the storage"""
+        engine = FileStorage()
+        storage = Cache(engine, size=2, ttl=0)
+        reads = []
+        engine.get = lambda cls, id: reads.append(id) or FileStorage.get(
+            engine, cls, id)
+        self.assertIs(storage.get(State, self.state.id), self.state)
+        self.assertIs(storage.get(State, self.state.id), self.state)
+        self.assertEqual(reads, [self.state.id])
+
+    def test_delete(self):
+        """Test that a deleted object is not served from the cache"""
+        self.storage.get(State, self.state.id)
+        self.storage.delete(self.state)
+        self.assertIsNone(self.storage.get(State, self.state.id))
+
+    def test_lru(self):
+        """Test that the least recently used entry is evicted"""
+        states = [State(name=str(i)) for i in range(2)]
+        for state in states:
+            self.storage.new(state)
+        self.storage.get(State, self.state.id)
+        self.storage.get(State, states[0].id)
+        self.storage.get(State, self.state.id)
+        self.storage.get(State, states[1].id)
+        self.assertEqual(self.storage.stats()["entries"], 2)
+        hits = self.storage.stats()["hits"]
+        self.storage.get(State, self.state.id)
+        self.assertEqual(self.storage.stats()["hits"], hits + 1)
+        self.storage.get(State, states[0].id)
+        self.assertEqual(self.storage.stats()["hits"], hits + 1)
+        for state in states:
+            self.storage.delete(state)
+
+    def test_ttl(self):
+        """Test that entries expire after ttl seconds"""
+        storage = Cache(FileStorage(), size=2, ttl=0.01)
+        storage.get(State, self.state.id)
+        time.sleep(0.02)
+        hits = storage.stats()["hits"]
+        storage.get(State, self.state.id)
+        self.assertEqual(storage.stats()["hits"], hits)
+
+    def test_disabled(self):
+        """Test that a cache of size 0 goes straight to the storage"""
+        storage = Cache(FileStorage(), size=0)
+        self.assertIs(storage.get(State, self.state.id), self.state)
+        self.assertEqual(storage.stats()["hits"] +
+                         storage.stats()["misses"], 0)
+        self.assertEqual(storage.count(State), FileStorage().count(State))
+
+    def test_threads(self):
+        """Test that concurrent reads and writes keep payloads current"""
+        def work():
+            for i in range(200):
+                self.storage.get(State, self.state.id)
+                self.storage.to_dict(self.state)
+        threads = [threading.Thread(target=work) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for i in range(50):
+            self.state.name = str(i)
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.storage.to_dict(self.state)["name"], "49")
@@ -0,0 +1,67 @@
+#!/usr/bin/python3
+"""
+Contains the TestCursorDocs and TestCursor classes
+"""
+
+from datetime import datetime
+import inspect
+from models.engine import cursor
+from models.state import State
+import pep8
+import unittest
+
+
+class TestCursorDocs(unittest.TestCase):
+    """Tests to check the documentation and style of cursor module"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.cursor_f = inspect.getmembers(cursor, inspect.isfunction)
+
+    def test_pep8_conformance_cursor(self):
+        """Test that models/engine/cursor.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/cursor.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_cursor(self):
+        """Test tests/test_models/test_engine/test_cursor.py PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_cursor.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_cursor_module_docstring(self):
+        """Test for the cursor.py module docstring"""
+        self.assertIsNot(cursor.__doc__, None,
+                         "cursor.py needs a docstring")
+        self.assertTrue(len(cursor.__doc__) >= 1,
+                        "cursor.py needs a docstring")
+
+    def test_cursor_func_docstrings(self):
+        """Test for the presence of docstrings in cursor functions"""
+        for func in self.cursor_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+class TestCursor(unittest.TestCase):
+    """Test the cursor module"""
+    def test_round_trip(self):
+        """Test that decode returns the created_at and id of the object"""
+        state = State(name="Hidden_Leaf_Village")
+        state.created_at = datetime(2017, 9, 28, 21, 5, 54, 119427)
+        token = cursor.encode(state)
+        self.assertNotIn("=", token)
+        self.assertEqual(cursor.decode(token), (state.created_at, state.id))
+
+    def test_invalid(self):
+        """Test that decode raises ValueError on garbage"""
+        for token in ("", "not a cursor", "bm90IGEgY3Vyc29y"):
+            with self.subTest(token=token):
+                with self.assertRaises(ValueError):
+                    cursor.decode(token)
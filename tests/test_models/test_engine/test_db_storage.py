@@ -6,7 +6,7 @@ Contains the TestDBStorageDocs and TestDBStorage classes
 from datetime import datetime
 import inspect
 import models
-from models.engine import db_storage
+from models.engine import cursor, db_storage
 from models.amenity import Amenity
 from models.base_model import BaseModel
 from models.city import City
@@ -17,6 +17,9 @@ from models.user import User
 import json
 import os
 import pep8
+from sqlalchemy import event
+from sqlalchemy.dialects import mysql
+from sqlalchemy.schema import CreateTable
 import unittest
 DBStorage = db_storage.DBStorage
 classes = {"Amenity": Amenity, "City": City, "Place": Place,
@@ -112,3 +115,145 @@ class TestFileStorage(unittest.TestCase):
         storage.save()
         len_objs = storage.count()
         self.assertEqual(len(storage.all()), len_objs)
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_get_missing(self):
+        """Tests get returns None for unknown ids"""
+        storage = models.storage
+        self.assertIsNone(storage.get(State, "missing-id"))
+        self.assertIsNone(storage.get(State, None))
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_counts(self):
+        """Tests counts returns count(cls) for every class"""
+        storage = models.storage
+        counts = storage.counts()
+        for key, value in classes.items():
+            self.assertEqual(counts[key], storage.count(value))
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_fingerprint(self):
+        """Tests fingerprint changes with the objects of a class"""
+        storage = models.storage
+        before = storage.fingerprint(State)
+        state = State(name="Fire")
+        storage.new(state)
+        storage.save()
+        added = storage.fingerprint(State)
+        self.assertEqual(added[0], before[0] + 1)
+        self.assertNotEqual(added[1], before[1])
+        storage.delete(state)
+        storage.save()
+        self.assertEqual(storage.fingerprint(State)[:2], before[:2])
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_fingerprint_kept(self):
+        """Tests fingerprint reuses its query until a commit changes the
+        class"""
+        storage = models.storage
+        engine = storage._Cache__storage._DBStorage__engine
+        first = storage.fingerprint(State)
+        statements = []
+
+        def executed(conn, cursor, statement, *args):
+            """records the statements sent to the database"""
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", executed)
+        try:
+            self.assertEqual(storage.fingerprint(State), first)
+            self.assertEqual(statements, [])
+        finally:
+            event.remove(engine, "before_cursor_execute", executed)
+        state = State(name="Wind")
+        storage.new(state)
+        storage.save()
+        self.assertEqual(storage.fingerprint(State)[0], first[0] + 1)
+        storage.delete(state)
+        storage.save()
+        self.assertEqual(storage.fingerprint(State)[:2], first[:2])
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_timestamp_microseconds(self):
+        """Tests the MySQL timestamps keep their microseconds so that two
+        saves in the same second change the fingerprint"""
+        table = str(CreateTable(State.__table__).compile(
+            dialect=mysql.dialect()))
+        self.assertIn("created_at DATETIME(6)", table)
+        self.assertIn("updated_at DATETIME(6)", table)
+        storage = models.storage
+        state = State(name="Fire")
+        storage.new(state)
+        storage.save()
+        first = storage.fingerprint(State)
+        state.updated_at = state.updated_at.replace(microsecond=(
+            state.updated_at.microsecond + 1) % 1000000)
+        storage.save()
+        self.assertNotEqual(storage.fingerprint(State)[1], first[1])
+        storage.delete(state)
+        storage.save()
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_all_load(self):
+        """Tests all loads the listed relationships along"""
+        storage = models.storage
+        state = State(name="Fire")
+        storage.new(state)
+        storage.new(City(name="Konoha", state_id=state.id))
+        storage.save()
+        storage.close()
+        states = storage.all(State, load=["cities.places"])
+        loaded = states["State." + state.id]
+        self.assertIn("cities", loaded.__dict__)
+        self.assertIn("places", loaded.cities[0].__dict__)
+        storage.delete(loaded.cities[0])
+        storage.delete(loaded)
+        storage.save()
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_filter(self):
+        """Tests filter matches values and lists of values"""
+        storage = models.storage
+        state = State(name="Fire")
+        city = City(name="Konoha", state_id=state.id)
+        storage.new(state)
+        storage.new(city)
+        storage.save()
+        key = "City." + city.id
+        self.assertEqual(list(storage.filter(City, state_id=state.id)),
+                         [key])
+        self.assertIn(key, storage.filter(City, name=["Konoha", "Suna"]))
+        self.assertEqual(storage.filter(City, state_id=state.id,
+                                        name="Suna"), {})
+        storage.delete(city)
+        storage.delete(state)
+        storage.save()
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_search_places(self):
+        """Tests search_places keeps places having every amenity"""
+        storage = models.storage
+        state = State(name="Hidden_Leaf_Village")
+        city = City(name="Konoha", state_id=state.id)
+        user = User(email="naruto@konoha.jp", password="ramen")
+        wifi = Amenity(name="Wifi")
+        pool = Amenity(name="Pool")
+        place_a = Place(name="A", city_id=city.id, user_id=user.id)
+        place_b = Place(name="B", city_id=city.id, user_id=user.id)
+        place_a.amenities.append(wifi)
+        place_b.amenities.extend([wifi, pool])
+        for obj in (state, city, user, wifi, pool, place_a, place_b):
+            storage.new(obj)
+        storage.save()
+        found = list(storage.search_places([state.id], [],
+                                           [wifi.id, pool.id]))
+        self.assertEqual(found, [place_b])
+        found = list(storage.search_places([], [city.id], [wifi.id]))
+        self.assertCountEqual(found, [place_a, place_b])
+        ordered = sorted([place_a, place_b],
+                         key=lambda place: (place.created_at, place.id))
+        found = storage.search_places([], [city.id], [wifi.id], 1)
+        self.assertEqual(found, ordered[:1])
+        found = storage.search_places([], [city.id], [wifi.id], 2,
+                                      cursor.encode(ordered[0]))
+        self.assertEqual(found, ordered[1:])
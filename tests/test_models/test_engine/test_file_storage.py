@@ -17,6 +17,11 @@ from models.user import User
 import json
 import os
 import pep8
+import subprocess
+import sys
+import tempfile
+import threading
+import time
 import unittest
 FileStorage = file_storage.FileStorage
 classes = {"Amenity": Amenity, "BaseModel": BaseModel, "City": City,
@@ -70,13 +75,28 @@ test_file_storage.py'])
 
 class TestFileStorage(unittest.TestCase):
     """Test the FileStorage class"""
+    @classmethod
+    def setUpClass(cls):
+        """Run the tests in a temporary directory, removed with the
+        snapshots, checksums and journals they leave"""
+        cls.cwd = os.getcwd()
+        cls.tmp = tempfile.TemporaryDirectory()
+        os.chdir(cls.tmp.name)
+
+    @classmethod
+    def tearDownClass(cls):
+        """Go back to the directory the tests started from"""
+        os.chdir(cls.cwd)
+        cls.tmp.cleanup()
+
     @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
     def test_all_returns_dict(self):
-        """Test that all returns the FileStorage.__objects attr"""
+        """Test that all returns a copy of the FileStorage.__objects attr"""
         storage = FileStorage()
         new_dict = storage.all()
         self.assertEqual(type(new_dict), dict)
-        self.assertIs(new_dict, storage._FileStorage__objects)
+        self.assertEqual(new_dict, storage._FileStorage__objects)
+        self.assertIsNot(new_dict, storage._FileStorage__objects)
 
     @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
     def test_new(self):
@@ -139,3 +159,770 @@ class TestFileStorage(unittest.TestCase):
         storage.save()
         len_objs = storage.count()
         self.assertEqual(len(storage.all()), len_objs)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_get_class_name(self):
+        """Tests get accepts the class name as well as the class"""
+        storage = FileStorage()
+        state_instance = State(name="Hidden_Rain_Village")
+        storage.new(state_instance)
+        self.assertIs(storage.get("State", state_instance.id), state_instance)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_get_missing(self):
+        """Tests get returns None for unknown ids and classes"""
+        storage = FileStorage()
+        state_instance = State(name="Hidden_Mist_Village")
+        storage.new(state_instance)
+        self.assertIsNone(storage.get(State, "missing-id"))
+        self.assertIsNone(storage.get(City, state_instance.id))
+        self.assertIsNone(storage.get(State, None))
+        self.assertIsNone(storage.get("Unknown", state_instance.id))
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_all_cls(self):
+        """Tests all(cls) only returns objects of that class"""
+        storage = FileStorage()
+        state_instance = State(name="Hidden_Leaf_Village")
+        city_instance = City(name="Konoha")
+        storage.new(state_instance)
+        storage.new(city_instance)
+        for cls in (State, "State"):
+            states = storage.all(cls)
+            self.assertIn("State." + state_instance.id, states)
+            self.assertNotIn("City." + city_instance.id, states)
+            for obj in states.values():
+                self.assertIs(type(obj), State)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_count_cls(self):
+        """Tests count(cls) follows new and delete"""
+        storage = FileStorage()
+        count = storage.count(Amenity)
+        amenity_instance = Amenity(name="Wifi")
+        storage.new(amenity_instance)
+        self.assertEqual(storage.count(Amenity), count + 1)
+        self.assertEqual(storage.count("Amenity"), count + 1)
+        storage.delete(amenity_instance)
+        self.assertEqual(storage.count(Amenity), count)
+        self.assertNotIn("Amenity." + amenity_instance.id,
+                         storage.all(Amenity))
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_counts(self):
+        """Tests counts returns count(cls) for every class"""
+        storage = FileStorage()
+        storage.new(Review(text="Great"))
+        counts = storage.counts()
+        for key, value in classes.items():
+            self.assertEqual(counts[key], storage.count(value))
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_all_load(self):
+        """Tests all accepts relationships to load"""
+        storage = FileStorage()
+        self.assertEqual(storage.all(State, load=["cities"]),
+                         storage.all(State))
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_filter(self):
+        """Tests filter follows new, attribute updates and delete"""
+        storage = FileStorage()
+        state_a = State(name="Fire")
+        state_b = State(name="Water")
+        city_instance = City(name="Konoha", state_id=state_a.id)
+        storage.new(city_instance)
+        key = "City." + city_instance.id
+        self.assertEqual(storage.filter(City, state_id=state_a.id),
+                         {key: city_instance})
+        city_instance.state_id = state_b.id
+        self.assertEqual(storage.filter(City, state_id=state_a.id), {})
+        self.assertEqual(storage.filter("City", state_id=[state_a.id,
+                                                          state_b.id]),
+                         {key: city_instance})
+        self.assertEqual(storage.filter(City, state_id=state_b.id,
+                                        name="Suna"), {})
+        self.assertIn(key, storage.filter(City, name=("Konoha", "Suna")))
+        storage.delete(city_instance)
+        self.assertEqual(storage.filter(City, state_id=state_b.id), {})
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_save_journal(self):
+        """Tests journal mode appends only the changed objects"""
+        storage = FileStorage()
+        journal = FileStorage._FileStorage__file_path + ".journal"
+        FileStorage._FileStorage__journal = True
+        try:
+            storage.save()
+            state = State(name="Hidden_Grass_Village")
+            storage.new(state)
+            storage.save()
+            state.name = "Hidden_Rain_Village"
+            storage.save()
+            storage.save()
+            with open(journal, "r") as f:
+                entries = [json.loads(line) for line in f][-2:]
+            self.assertEqual(entries[0]["key"], "State." + state.id)
+            self.assertEqual(entries[1]["value"], state.to_dict())
+            state.name = "Not_Saved"
+            storage.reload()
+            self.assertEqual(storage.get(State, state.id).name,
+                             "Hidden_Rain_Village")
+            storage.delete(storage.get(State, state.id))
+            storage.save()
+            storage.compact()
+            self.assertFalse(os.path.exists(journal))
+            storage.reload()
+            self.assertIsNone(storage.get(State, state.id))
+        finally:
+            FileStorage._FileStorage__journal = False
+            storage.save()
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_compact_overlapping(self):
+        """Tests a compaction started while another waits to write its
+        snapshot keeps the entries appended in between"""
+        storage = FileStorage()
+        journal = FileStorage._FileStorage__file_path + ".journal"
+        lock = FileStorage._FileStorage__flush_lock
+        waiting = threading.Event()
+        written = threading.Event()
+        threads = [threading.Thread(target=storage.compact)
+                   for i in range(2)]
+
+        class Gate:
+            """flush lock letting the second compaction write first when
+            both get there"""
+
+            def __enter__(self):
+                if threading.current_thread() is threads[0]:
+                    waiting.set()
+                    written.wait(1)
+                lock.acquire()
+
+            def __exit__(self, *args):
+                lock.release()
+                if threading.current_thread() is threads[1]:
+                    written.set()
+
+        FileStorage._FileStorage__journal = True
+        try:
+            first = State(name="Hidden_Leaf_Village")
+            storage.new(first)
+            storage.save()
+            FileStorage._FileStorage__flush_lock = Gate()
+            threads[0].start()
+            waiting.wait(10)
+            second = State(name="Hidden_Sand_Village")
+            storage.new(second)
+            entry = {"key": "State." + second.id, "value": second.to_dict()}
+            with open(journal, "a") as f:
+                f.write(json.dumps(entry) + "\n")
+            threads[1].start()
+            for thread in threads:
+                thread.join()
+            for state in (first, second):
+                del FileStorage._FileStorage__objects["State." + state.id]
+            storage.reload()
+            for state in (first, second):
+                self.assertEqual(storage.get(State, state.id).name,
+                                 state.name)
+                storage.delete(storage.get(State, state.id))
+        finally:
+            FileStorage._FileStorage__flush_lock = lock
+            FileStorage._FileStorage__journal = False
+            storage.save()
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_close_during_save(self):
+        """Tests close never reloads the snapshot a save of this storage
+        is writing"""
+        storage = FileStorage()
+        state = State(name="Hidden_Frost_Village")
+        storage.new(state)
+        storage.save()
+        reloads = []
+        listener = reloads.append
+        stop = threading.Event()
+
+        def close():
+            """closes the storage until stopped"""
+            while not stop.is_set():
+                storage.close()
+
+        storage.listen(listener)
+        thread = threading.Thread(target=close)
+        thread.start()
+        try:
+            for i in range(200):
+                state.name = "Hidden_Frost_Village_{}".format(i)
+                storage.save()
+        finally:
+            stop.set()
+            thread.join()
+            FileStorage._FileStorage__listeners.remove(listener)
+        self.assertNotIn(None, reloads)
+        self.assertIs(storage.get(State, state.id), state)
+        storage.delete(state)
+        storage.save()
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_close_unchanged(self):
+        """Tests close keeps the objects when the file did not change"""
+        storage = FileStorage()
+        state = State(name="Hidden_Mist_Village")
+        storage.new(state)
+        storage.save()
+        storage.close()
+        self.assertIs(storage.get(State, state.id), state)
+        with open("file.json", "r") as f:
+            content = f.read()
+        with open("file.json", "w") as f:
+            f.write(content.replace("Hidden_Mist_Village", "Mist_Village"))
+        storage.close()
+        self.assertEqual(storage.get(State, state.id).name, "Mist_Village")
+        storage.delete(storage.get(State, state.id))
+        storage.save()
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_close_journal_tail(self):
+        """Tests close only replays the entries appended by others"""
+        storage = FileStorage()
+        journal = FileStorage._FileStorage__file_path + ".journal"
+        FileStorage._FileStorage__journal = True
+        try:
+            storage.save()
+            state = State(name="Hidden_Grass_Village")
+            storage.new(state)
+            storage.save()
+            storage.close()
+            self.assertIs(storage.get(State, state.id), state)
+            other = State(name="Hidden_Rain_Village")
+            entry = {"key": "State." + other.id, "value": other.to_dict()}
+            with open(journal, "a") as f:
+                f.write(json.dumps(entry) + "\n")
+            storage.close()
+            self.assertIs(storage.get(State, state.id), state)
+            self.assertEqual(storage.get(State, other.id).name,
+                             "Hidden_Rain_Village")
+            storage.delete(state)
+            storage.delete(storage.get(State, other.id))
+        finally:
+            FileStorage._FileStorage__journal = False
+            storage.save()
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_reload_record_per_line(self):
+        """Tests save writes one object per line and reload reads it back"""
+        storage = FileStorage()
+        state = State(name="Hidden_Stone_Village")
+        storage.new(state)
+        storage.save()
+        with open("file.json", "r") as f:
+            lines = f.readlines()
+        self.assertEqual(lines[0], "{\n")
+        self.assertEqual(lines[-1], "}\n")
+        self.assertEqual(len(lines), storage.count() + 2)
+        del FileStorage._FileStorage__objects["State." + state.id]
+        storage.reload()
+        self.assertEqual(storage.get(State, state.id).to_dict(),
+                         state.to_dict())
+        stats = storage.load_stats()
+        self.assertGreaterEqual(stats["objects"], storage.count())
+        for key in ("seconds", "objects_per_sec", "peak_rss_kb"):
+            self.assertIn(key, stats)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_reload_single_line(self):
+        """Tests reload still reads a snapshot written on a single line"""
+        storage = FileStorage()
+        state = State(name="Hidden_Snow_Village")
+        storage.save()
+        with open("file.json", "w") as f:
+            json.dump({"State." + state.id: state.to_dict()}, f)
+        storage.reload()
+        self.assertEqual(storage.get(State, state.id).name,
+                         "Hidden_Snow_Village")
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_reload_lazy(self):
+        """Tests lazy mode only builds instances when they are accessed"""
+        storage = FileStorage()
+        state = State(name="Hidden_Waterfall_Village")
+        storage.new(state)
+        storage.save()
+        count = storage.count()
+        key = "State." + state.id
+        FileStorage._FileStorage__lazy = True
+        try:
+            storage.reload()
+            self.assertNotIn(key, FileStorage._FileStorage__objects)
+            self.assertEqual(storage.count(), count)
+            hydrated = storage.get(State, state.id)
+            self.assertIsNot(hydrated, state)
+            self.assertEqual(hydrated.to_dict(), state.to_dict())
+            self.assertIn(key, FileStorage._FileStorage__objects)
+            self.assertEqual(storage.count(), count)
+            storage.reload()
+            storage.save()
+            self.assertEqual(storage.count(), count)
+            self.assertIn(key, storage.all(State))
+        finally:
+            FileStorage._FileStorage__lazy = False
+            storage.all()
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_filter_lazy_properties(self):
+        """Tests filters on properties do not hydrate while reading"""
+        storage = FileStorage()
+        amenity = Amenity(name="Hot_Springs")
+        place = Place(name="Hidden_Mist_Village", city_id="c", user_id="u",
+                      amenity_ids=[amenity.id])
+        storage.new(amenity)
+        storage.new(place)
+        storage.save()
+        FileStorage._FileStorage__lazy = True
+        try:
+            storage.reload()
+            self.assertEqual(storage.filter(Place, amenities=[amenity]), {})
+            key = "Place." + place.id
+            self.assertIn(key, storage.filter(Place, name=place.name))
+            objs, after = storage.page(Place, {"name": place.name})
+            self.assertEqual([obj.id for obj in objs], [place.id])
+            self.assertNotIn("Amenity." + amenity.id,
+                             FileStorage._FileStorage__objects)
+        finally:
+            FileStorage._FileStorage__lazy = False
+            storage.all()
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_new_shares_related_ids(self):
+        """Tests objects related to the same parent share its id string"""
+        storage = FileStorage()
+        state_id = "".join(["Hidden_", "Sand_", "Village"])
+        city_a = City(name="Suna", state_id=state_id)
+        city_b = City(name="Kaze",
+                      state_id="".join(["Hidden_Sand_", "Village"]))
+        self.assertIsNot(city_a.state_id, city_b.state_id)
+        storage.new(city_a)
+        storage.new(city_b)
+        self.assertIs(city_a.state_id, city_b.state_id)
+        self.assertEqual(city_a.to_dict()["state_id"], state_id)
+        storage.delete(city_a)
+        storage.delete(city_b)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_page(self):
+        """Tests page walks a class in (created_at, id) order"""
+        storage = FileStorage()
+        amenities = [Amenity(name=str(i)) for i in range(5)]
+        for amenity in reversed(amenities):
+            storage.new(amenity)
+        found = []
+        objs, after = storage.page(Amenity, None, 2)
+        while after is not None:
+            self.assertEqual(len(objs), 2)
+            found.extend(objs)
+            objs, after = storage.page(Amenity, None, 2, after)
+        found.extend(objs)
+        everything, after = storage.page(Amenity)
+        self.assertIsNone(after)
+        self.assertEqual(found, everything)
+        self.assertEqual(len(found), storage.count(Amenity))
+        positions = [(obj.created_at, obj.id) for obj in found]
+        self.assertEqual(positions, sorted(positions))
+        for amenity in amenities:
+            storage.delete(amenity)
+        self.assertEqual(len(storage.page(Amenity)[0]),
+                         storage.count(Amenity))
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_page_filters(self):
+        """Tests page only returns the objects matching the filters"""
+        storage = FileStorage()
+        state = State(name="Hidden_Leaf_Village")
+        cities = [City(name=str(i % 2), state_id=state.id) for i in range(5)]
+        for city in cities:
+            storage.new(city)
+        objs, after = storage.page(City, {"state_id": state.id}, 2)
+        self.assertEqual(objs, cities[:2])
+        objs, after = storage.page(City, {"state_id": state.id}, 2, after)
+        self.assertEqual(objs, cities[2:4])
+        objs, after = storage.page(City, {"state_id": state.id,
+                                          "name": "0"})
+        self.assertEqual(objs, cities[0::2])
+        self.assertIsNone(after)
+        for city in cities:
+            storage.delete(city)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_fingerprint(self):
+        """Tests fingerprint follows new, updated_at and delete"""
+        storage = FileStorage()
+        before = storage.fingerprint(State)
+        state = State(name="Fire")
+        storage.new(state)
+        added = storage.fingerprint("State")
+        self.assertEqual(added[0], before[0] + 1)
+        self.assertNotEqual(added[1], before[1])
+        self.assertEqual(added[2], state.updated_at)
+        state.name = "Water"
+        self.assertEqual(storage.fingerprint(State), added)
+        state.updated_at = datetime.utcnow()
+        self.assertNotEqual(storage.fingerprint(State)[1], added[1])
+        storage.delete(state)
+        self.assertEqual(storage.fingerprint(State)[:2], before[:2])
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_iterate(self):
+        """Tests iterate yields the objects of page lazily"""
+        storage = FileStorage()
+        state = State(name="Hidden_Leaf_Village")
+        cities = [City(name=str(i), state_id=state.id) for i in range(3)]
+        for city in cities:
+            storage.new(city)
+        objs = storage.iterate(City, {"state_id": state.id})
+        self.assertIs(next(objs), cities[0])
+        storage.delete(cities[1])
+        storage.new(City(name="late", state_id=state.id))
+        self.assertEqual(list(objs), [cities[2]])
+        self.assertEqual(list(storage.iterate(City)),
+                         storage.page(City)[0])
+        for city in storage.filter(City, state_id=state.id).values():
+            storage.delete(city)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_threads(self):
+        """Tests concurrent writers, readers and saves keep the storage
+        consistent"""
+        storage = FileStorage()
+        state = State(name="Hidden_Mist_Village")
+        storage.new(state)
+        before = storage.count(City)
+        errors = []
+
+        def write(n):
+            for i in range(200):
+                city = City(name=str(i), state_id=state.id)
+                storage.new(city)
+                city.name = "renamed"
+                if i % 2:
+                    storage.delete(city)
+
+        def read():
+            for i in range(200):
+                cities = storage.filter(City, state_id=state.id)
+                self.assertTrue(all(city.state_id == state.id
+                                    for city in cities.values()))
+                storage.all(City)
+                storage.page(City, {"state_id": state.id}, 10)
+                storage.fingerprint(City)
+
+        def run(target, *args):
+            try:
+                target(*args)
+            except Exception as e:
+                errors.append(e)
+        threads = [threading.Thread(target=run, args=(write, n))
+                   for n in range(4)]
+        threads += [threading.Thread(target=run, args=(read,))
+                    for n in range(4)]
+        threads.append(threading.Thread(target=run, args=(storage.save,)))
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        cities = storage.filter(City, state_id=state.id)
+        self.assertEqual(len(cities), 400)
+        self.assertEqual(storage.count(City), before + 400)
+        self.assertEqual(storage.fingerprint(City)[0], before + 400)
+        self.assertEqual(len(storage.page(City)[0]), before + 400)
+        stats = storage.lock_stats()
+        self.assertGreater(stats["read"]["acquired"], 0)
+        self.assertGreater(stats["write"]["acquired"], 0)
+        for city in cities.values():
+            storage.delete(city)
+        storage.delete(state)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_shards_failed_write(self):
+        """Tests a failed shard write keeps the whole snapshot and the
+        classes to write until a save writes every shard"""
+        storage = FileStorage()
+        state = State(name="Hidden_Sound_Village")
+        amenity = Amenity(name="Sauna")
+        storage.new(state)
+        storage.new(amenity)
+        storage.save()
+        FileStorage._FileStorage__shards = True
+        try:
+            storage.reload()
+            # a directory in place of a shard makes its rename fail
+            os.mkdir("file.City.json")
+            with self.assertRaises(OSError):
+                storage.save()
+            self.assertTrue(os.path.exists("file.json"))
+            self.assertEqual([name for name in os.listdir(".")
+                              if name.endswith(".tmp")], [])
+            os.rmdir("file.City.json")
+            storage.save()
+            self.assertFalse(os.path.exists("file.json"))
+            del FileStorage._FileStorage__objects["State." + state.id]
+            del FileStorage._FileStorage__objects["Amenity." + amenity.id]
+            storage.reload()
+            self.assertIsNotNone(storage.get(State, state.id))
+            self.assertIsNotNone(storage.get(Amenity, amenity.id))
+            storage.delete(storage.get(Amenity, amenity.id))
+            storage.delete(storage.get(State, state.id))
+        finally:
+            FileStorage._FileStorage__shards = False
+            if os.path.isdir("file.City.json"):
+                os.rmdir("file.City.json")
+            storage.save()
+            for name in classes:
+                for path in ("file." + name + ".json",
+                             "file." + name + ".json.sum"):
+                    if os.path.exists(path):
+                        os.remove(path)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_save_deferred(self):
+        """Tests save leaves the write to the flusher with an interval"""
+        storage = FileStorage()
+        storage.save()
+        FileStorage._FileStorage__flush_interval = 0.05
+        try:
+            state = State(name="Hidden_Cloud_Village")
+            storage.new(state)
+            storage.save()
+            with open("file.json", "r") as f:
+                self.assertNotIn(state.id, f.read())
+            for i in range(100):
+                time.sleep(0.05)
+                with open("file.json", "r") as f:
+                    if state.id in f.read():
+                        break
+            else:
+                self.fail("the flusher did not write the save")
+            city = City(name="Kumo", state_id=state.id)
+            storage.new(city)
+            storage.save(sync=True)
+            with open("file.json", "r") as f:
+                self.assertIn(city.id, f.read())
+            storage.delete(city)
+            storage.delete(state)
+        finally:
+            FileStorage._FileStorage__flush_interval = 0
+            storage.flush()
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_save_deferred_exit(self):
+        """Tests the pending save is flushed when the process exits"""
+        script = ("from models import storage\n"
+                  "from models.state import State\n"
+                  "state = State(name='Hidden_Moon_Village')\n"
+                  "storage.new(state)\n"
+                  "storage.save()\n"
+                  "print(state.id)\n")
+        env = dict(os.environ, HBNB_FILE_FLUSH_INTERVAL="60",
+                   PYTHONPATH=self.cwd)
+        with tempfile.TemporaryDirectory() as path:
+            out = subprocess.run([sys.executable, "-c", script], cwd=path,
+                                 env=env, check=True, timeout=30,
+                                 stdout=subprocess.PIPE)
+            with open(os.path.join(path, "file.json"), "r") as f:
+                saved = json.load(f)
+        self.assertIn("State." + out.stdout.decode().strip(), saved)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_save_deferred_sigterm(self):
+        """Tests the pending save is flushed when the process is
+        terminated"""
+        script = ("import os, signal, time\n"
+                  "from models import storage\n"
+                  "from models.state import State\n"
+                  "state = State(name='Hidden_Star_Village')\n"
+                  "storage.new(state)\n"
+                  "storage.save()\n"
+                  "print(state.id, flush=True)\n"
+                  "os.kill(os.getpid(), signal.SIGTERM)\n"
+                  "time.sleep(30)\n")
+        env = dict(os.environ, HBNB_FILE_FLUSH_INTERVAL="60",
+                   PYTHONPATH=self.cwd)
+        with tempfile.TemporaryDirectory() as path:
+            out = subprocess.run([sys.executable, "-c", script], cwd=path,
+                                 env=env, timeout=30,
+                                 stdout=subprocess.PIPE)
+            self.assertEqual(out.returncode, 128 + 15)
+            with open(os.path.join(path, "file.json"), "r") as f:
+                saved = json.load(f)
+        self.assertIn("State." + out.stdout.decode().strip(), saved)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_save_deferred_retry(self):
+        """Tests a failed deferred save is logged and written by the next
+        flush"""
+        storage = FileStorage()
+        storage.save()
+        FileStorage._FileStorage__journal = True
+        FileStorage._FileStorage__flush_interval = 0.05
+        # a directory in place of the journal makes the appends fail
+        os.mkdir("file.json.journal")
+        try:
+            state = State(name="Hidden_Rain_Village")
+            with self.assertLogs(file_storage.logger, "ERROR") as logs:
+                storage.new(state)
+                storage.save()
+                for i in range(100):
+                    time.sleep(0.05)
+                    if logs.records:
+                        break
+            os.rmdir("file.json.journal")
+            for i in range(100):
+                time.sleep(0.05)
+                if os.path.exists("file.json.journal"):
+                    with open("file.json.journal", "r") as f:
+                        if state.id in f.read():
+                            break
+            else:
+                self.fail("the flusher did not write the save")
+            storage.reload()
+            self.assertIsNotNone(storage.get(State, state.id))
+            storage.delete(storage.get(State, state.id))
+        finally:
+            FileStorage._FileStorage__journal = False
+            FileStorage._FileStorage__flush_interval = 0
+            if os.path.isdir("file.json.journal"):
+                os.rmdir("file.json.journal")
+            storage.flush()
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_save_checksum(self):
+        """Tests save replaces the snapshot whole and records its checksum
+        along with the one of the snapshot it replaces"""
+        storage = FileStorage()
+        storage.save()
+        state = State(name="Hidden_Valley_Village")
+        storage.new(state)
+        storage.save()
+        self.assertFalse(os.path.exists("file.json.tmp"))
+        stat = os.stat("file.json")
+        with open("file.json.sum", "r") as f:
+            lines = [line.split() for line in f]
+        self.assertEqual(len(lines), 2)
+        self.assertEqual(lines[0][1:], [str(stat.st_ino), str(stat.st_size),
+                                        str(stat.st_mtime_ns)])
+        storage.reload()
+        storage.delete(storage.get(State, state.id))
+        storage.save()
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_reload_corrupt(self):
+        """Tests reload sets aside a snapshot not matching its checksum,
+        even after a write that was not renamed over it"""
+        storage = FileStorage()
+        state = State(name="Hidden_Hot_Water_Village")
+        storage.new(state)
+        storage.save()
+        storage._FileStorage__write_snapshot(iter(()), "file.json")
+        os.remove("file.json.tmp")
+        # flips bytes in place as a failing disk would, stamp unchanged
+        stat = os.stat("file.json")
+        with open("file.json", "r+") as f:
+            content = f.read()
+            f.seek(0)
+            f.write(content.replace("Hot_Water", "Hot_Steam"))
+        os.utime("file.json", ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        del FileStorage._FileStorage__objects["State." + state.id]
+        with self.assertLogs(file_storage.logger, "WARNING"):
+            storage.reload()
+        self.assertIsNone(storage.get(State, state.id))
+        self.assertFalse(os.path.exists("file.json"))
+        aside = [name for name in os.listdir(".")
+                 if name.startswith("file.json.corrupt-")]
+        self.assertEqual(len(aside), 2)
+        for name in aside:
+            os.remove(name)
+        storage.save()
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_reload_edited(self):
+        """Tests reload reads a snapshot edited since it was saved"""
+        storage = FileStorage()
+        state = State(name="Hidden_Whirlpool_Village")
+        storage.new(state)
+        storage.save()
+        with open("file.json", "r") as f:
+            content = f.read()
+        with open("file.json", "w") as f:
+            f.write(content.replace("Whirlpool", "Eddy"))
+        del FileStorage._FileStorage__objects["State." + state.id]
+        storage.reload()
+        self.assertEqual(storage.get(State, state.id).name,
+                         "Hidden_Eddy_Village")
+        storage.delete(storage.get(State, state.id))
+        storage.save()
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_reload_torn(self):
+        """Tests reload keeps none of the objects of a snapshot failing to
+        parse partway"""
+        storage = FileStorage()
+        states = [State(name="Hidden_Village_{}".format(i))
+                  for i in range(4)]
+        lines = [json.dumps({"State." + state.id: state.to_dict()})[1:-1]
+                 for state in states]
+        lines[2] = lines[2][:len(lines[2]) // 2]
+        with open("file.json", "w") as f:
+            f.write("{\n" + ",\n".join(lines) + "\n}\n")
+        with self.assertLogs(file_storage.logger, "WARNING"):
+            storage.reload()
+        for state in states:
+            self.assertIsNone(storage.get(State, state.id))
+        storage.save()
+        with open("file.json", "r") as f:
+            content = f.read()
+        for state in states:
+            self.assertNotIn(state.id, content)
+        for name in os.listdir("."):
+            if name.startswith("file.json.corrupt-"):
+                os.remove(name)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_shards(self):
+        """Tests shard mode only rewrites the files of changed classes and
+        reloads them all"""
+        storage = FileStorage()
+        state = State(name="Hidden_Star_Village")
+        storage.new(state)
+        storage.save()
+        FileStorage._FileStorage__shards = True
+        try:
+            storage.reload()
+            storage.save()
+            self.assertFalse(os.path.exists("file.json"))
+            for name in classes:
+                self.assertTrue(os.path.exists("file." + name + ".json"))
+            before = os.stat("file.State.json").st_ino
+            amenity = Amenity(name="Wifi")
+            storage.new(amenity)
+            storage.save()
+            self.assertEqual(os.stat("file.State.json").st_ino, before)
+            with open("file.Amenity.json", "r") as f:
+                self.assertIn(amenity.id, f.read())
+            del FileStorage._FileStorage__objects["State." + state.id]
+            storage.reload()
+            self.assertEqual(storage.get(State, state.id).name,
+                             "Hidden_Star_Village")
+            self.assertIsNotNone(storage.get(Amenity, amenity.id))
+            storage.delete(storage.get(Amenity, amenity.id))
+            storage.delete(storage.get(State, state.id))
+        finally:
+            FileStorage._FileStorage__shards = False
+            storage.save()
+            for name in classes:
+                for path in ("file." + name + ".json",
+                             "file." + name + ".json.sum"):
+                    if os.path.exists(path):
+                        os.remove(path)
@@ -0,0 +1,117 @@
+#!/usr/bin/python3
+"""
+Contains the TestRWLockDocs and TestRWLock classes
+"""
+
+import inspect
+from models.engine import locks
+from models.engine.locks import RWLock
+import pep8
+import threading
+import time
+import unittest
+
+
+class TestRWLockDocs(unittest.TestCase):
+    """Tests to check the documentation and style of RWLock class"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.lock_f = inspect.getmembers(RWLock, inspect.isfunction)
+
+    def test_pep8_conformance_locks(self):
+        """Test that models/engine/locks.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/locks.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_locks(self):
+        """Test tests/test_models/test_engine/test_locks.py PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_locks.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_locks_module_docstring(self):
+        """Test for the locks.py module docstring"""
+        self.assertIsNot(locks.__doc__, None,
+                         "locks.py needs a docstring")
+        self.assertTrue(len(locks.__doc__) >= 1,
+                        "locks.py needs a docstring")
+
+    def test_locks_class_docstring(self):
+        """Test for the RWLock class docstring"""
+        self.assertIsNot(RWLock.__doc__, None,
+                         "RWLock class needs a docstring")
+        self.assertTrue(len(RWLock.__doc__) >= 1,
+                        "RWLock class needs a docstring")
+
+    def test_rwlock_func_docstrings(self):
+        """Test for the presence of docstrings in RWLock methods"""
+        for func in self.lock_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+class TestRWLock(unittest.TestCase):
+    """Test the RWLock class"""
+    def test_readers_share(self):
+        """Test that readers hold the lock together"""
+        lock = RWLock()
+        inside = threading.Barrier(2, timeout=5)
+
+        def read():
+            with lock.read():
+                inside.wait()
+        thread = threading.Thread(target=read)
+        thread.start()
+        read()
+        thread.join()
+        self.assertEqual(lock.stats()["read"]["acquired"], 2)
+
+    def test_writer_excludes(self):
+        """Test that a writer waits for the reader and holds alone"""
+        lock = RWLock()
+        order = []
+
+        def write():
+            with lock.write():
+                order.append("write")
+        with lock.read():
+            thread = threading.Thread(target=write)
+            thread.start()
+            time.sleep(0.05)
+            order.append("read")
+        thread.join()
+        self.assertEqual(order, ["read", "write"])
+        stats = lock.stats()["write"]
+        self.assertEqual(stats["acquired"], 1)
+        self.assertGreater(stats["max_wait_seconds"], 0.0)
+
+    def test_reentrant(self):
+        """Test that the lock is reentrant and a writer may read"""
+        lock = RWLock()
+        with lock.write():
+            with lock.write():
+                with lock.read():
+                    pass
+        with lock.read():
+            with lock.read():
+                pass
+        stats = lock.stats()
+        self.assertEqual(stats["write"]["acquired"], 1)
+        self.assertEqual(stats["read"]["acquired"], 1)
+
+    def test_upgrade(self):
+        """Test that a reader cannot become a writer"""
+        lock = RWLock()
+        with lock.read():
+            with self.assertRaises(RuntimeError):
+                with lock.write():
+                    pass
+        with lock.write():
+            pass
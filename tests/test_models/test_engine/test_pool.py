@@ -0,0 +1,147 @@
+#!/usr/bin/python3
+"""
+Contains the TestMeteredPoolDocs and TestMeteredPool classes
+"""
+
+from api.v1.app import app
+import inspect
+import models
+from models.engine import pool
+from models.engine.pool import MeteredPool
+from models.state import State
+import pep8
+from sqlalchemy.exc import TimeoutError
+import threading
+import time
+import unittest
+
+
+class TestMeteredPoolDocs(unittest.TestCase):
+    """Tests to check the documentation and style of MeteredPool class"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.pool_f = inspect.getmembers(MeteredPool, inspect.isfunction)
+
+    def test_pep8_conformance_pool(self):
+        """Test that models/engine/pool.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/pool.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_pool(self):
+        """Test tests/test_models/test_engine/test_pool.py PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_pool.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pool_module_docstring(self):
+        """Test for the pool.py module docstring"""
+        self.assertIsNot(pool.__doc__, None,
+                         "pool.py needs a docstring")
+        self.assertTrue(len(pool.__doc__) >= 1,
+                        "pool.py needs a docstring")
+
+    def test_pool_class_docstring(self):
+        """Test for the MeteredPool class docstring"""
+        self.assertIsNot(MeteredPool.__doc__, None,
+                         "MeteredPool class needs a docstring")
+        self.assertTrue(len(MeteredPool.__doc__) >= 1,
+                        "MeteredPool class needs a docstring")
+
+
+class Connection:
+    """Stand-in for a DBAPI connection"""
+    def rollback(self):
+        """Roll back nothing"""
+
+    def close(self):
+        """Close nothing"""
+
+
+class TestMeteredPool(unittest.TestCase):
+    """Test the metrics of MeteredPool"""
+    def test_metrics(self):
+        """Test checkouts, overflows and timeouts are counted"""
+        metered = MeteredPool(Connection, pool_size=1, max_overflow=1,
+                              timeout=0.01)
+        first = metered.connect()
+        second = metered.connect()
+        stats = metered.stats()
+        self.assertEqual(stats["checkouts"], 2)
+        self.assertEqual(stats["connects"], 2)
+        self.assertEqual(stats["overflows"], 1)
+        self.assertEqual(stats["checked_out"], 2)
+        self.assertEqual(stats["overflow"], 1)
+        with self.assertRaises(TimeoutError):
+            metered.connect()
+        self.assertEqual(metered.stats()["timeouts"], 1)
+        self.assertGreaterEqual(metered.stats()["max_wait_seconds"], 0.01)
+        second.close()
+        first.close()
+        stats = metered.stats()
+        self.assertEqual(stats["checked_out"], 0)
+        self.assertEqual(stats["overflow"], 0)
+
+    def test_overflow_reuse(self):
+        """Test that a pooled connection checked out while an overflow
+        connection is open is not counted as an overflow"""
+        metered = MeteredPool(Connection, pool_size=1, max_overflow=1)
+        first = metered.connect()
+        second = metered.connect()
+        first.close()
+        third = metered.connect()
+        stats = metered.stats()
+        self.assertEqual(stats["checkouts"], 3)
+        self.assertEqual(stats["connects"], 2)
+        self.assertEqual(stats["overflows"], 1)
+        third.close()
+        second.close()
+
+    def test_wait_excludes_connect(self):
+        """Test that opening a connection is not counted as waiting"""
+        def slow():
+            """Open a Connection in 50 milliseconds"""
+            time.sleep(0.05)
+            return Connection()
+        metered = MeteredPool(slow, pool_size=1, max_overflow=0)
+        metered.connect().close()
+        self.assertLess(metered.stats()["max_wait_seconds"], 0.05)
+
+
+class TestMeteredPoolLoad(unittest.TestCase):
+    """Test the pool of DBStorage under concurrent requests"""
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_concurrent_requests(self):
+        """Test 200 concurrent requests share the pool without timing out
+        nor leaking connections"""
+        state = State(name="Fire")
+        models.storage.new(state)
+        models.storage.save()
+        before = models.storage.pool_stats()
+        start = threading.Barrier(200, timeout=30)
+        statuses = []
+
+        def request():
+            """Get the state once every thread is ready"""
+            client = app.test_client()
+            start.wait()
+            statuses.append(
+                client.get("/api/v1/states/" + state.id).status_code)
+        threads = [threading.Thread(target=request) for i in range(200)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        stats = models.storage.pool_stats()
+        self.assertEqual(statuses, [200] * 200)
+        self.assertEqual(stats["timeouts"], before["timeouts"])
+        self.assertGreaterEqual(stats["checkouts"] - before["checkouts"],
+                                200)
+        self.assertEqual(stats["checked_out"], 0)
+        self.assertEqual(stats["overflow"], 0)
+        models.storage.delete(state)
+        models.storage.save()
@@ -0,0 +1,134 @@
+#!/usr/bin/python3
+"""
+Contains the TestSearchDocs and TestSearch classes
+"""
+
+import inspect
+import models
+from models.engine import cursor, search
+from models.amenity import Amenity
+from models.city import City
+from models.place import Place
+from models.state import State
+import pep8
+import unittest
+
+
+class TestSearchDocs(unittest.TestCase):
+    """Tests to check the documentation and style of search module"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.search_f = inspect.getmembers(search, inspect.isfunction)
+
+    def test_pep8_conformance_search(self):
+        """Test that models/engine/search.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/search.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_search(self):
+        """Test tests/test_models/test_engine/test_search.py PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_search.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_search_module_docstring(self):
+        """Test for the search.py module docstring"""
+        self.assertIsNot(search.__doc__, None,
+                         "search.py needs a docstring")
+        self.assertTrue(len(search.__doc__) >= 1,
+                        "search.py needs a docstring")
+
+    def test_search_func_docstrings(self):
+        """Test for the presence of docstrings in search functions"""
+        for func in self.search_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestSearch(unittest.TestCase):
+    """Test the search_places function on the file storage"""
+    @classmethod
+    def setUpClass(cls):
+        """Create two states with a city and two places each"""
+        cls.objs = []
+        cls.wifi = Amenity(name="Wifi")
+        cls.pool = Amenity(name="Pool")
+        cls.states = [State(name="Leaf"), State(name="Sand")]
+        cls.cities = [City(name="Konoha", state_id=cls.states[0].id),
+                      City(name="Suna", state_id=cls.states[1].id)]
+        cls.places = [
+            Place(name="A", city_id=cls.cities[0].id,
+                  amenity_ids=[cls.wifi.id]),
+            Place(name="B", city_id=cls.cities[0].id,
+                  amenity_ids=[cls.wifi.id, cls.pool.id]),
+            Place(name="C", city_id=cls.cities[1].id,
+                  amenity_ids=[cls.pool.id]),
+            Place(name="D", city_id=cls.cities[1].id)]
+        cls.objs = ([cls.wifi, cls.pool] + cls.states + cls.cities +
+                    cls.places)
+        for obj in cls.objs:
+            models.storage.new(obj)
+
+    @classmethod
+    def tearDownClass(cls):
+        """Remove the objects from the storage"""
+        for obj in cls.objs:
+            models.storage.delete(obj)
+
+    def names(self, **filters):
+        """Return the sorted names of the places found with filters"""
+        places = search.search_places(models.storage, **filters)
+        return sorted(place.name for place in places
+                      if place in self.places)
+
+    def test_no_filter(self):
+        """Test that no filter returns every place"""
+        self.assertEqual(self.names(), ["A", "B", "C", "D"])
+
+    def test_states_and_cities(self):
+        """Test that states and cities are combined"""
+        self.assertEqual(self.names(states=[self.states[0].id]), ["A", "B"])
+        self.assertEqual(self.names(states=[self.states[0].id],
+                                    cities=[self.cities[1].id]),
+                         ["A", "B", "C", "D"])
+
+    def test_amenities(self):
+        """Test that places must have every amenity"""
+        self.assertEqual(self.names(amenities=[self.wifi.id]), ["A", "B"])
+        self.assertEqual(self.names(amenities=[self.wifi.id, self.pool.id]),
+                         ["B"])
+        self.assertEqual(self.names(cities=[self.cities[1].id],
+                                    amenities=[self.pool.id]), ["C"])
+
+    def test_amenity_update(self):
+        """Test that the amenity index follows amenity_ids updates"""
+        place = self.places[3]
+        place.amenity_ids = [self.wifi.id]
+        self.assertEqual(self.names(amenities=[self.wifi.id]),
+                         ["A", "B", "D"])
+        place.amenity_ids = []
+        self.assertEqual(self.names(amenities=[self.wifi.id]), ["A", "B"])
+
+    def test_page(self):
+        """Test that limit and after page the places in (created_at, id)
+        order"""
+        states = [state.id for state in self.states]
+        expected = sorted(self.places,
+                          key=lambda place: (place.created_at, place.id))
+        first = search.search_places(models.storage, states, limit=3)
+        self.assertEqual(first, expected[:3])
+        rest = search.search_places(models.storage, states, limit=3,
+                                    after=cursor.encode(first[1]))
+        self.assertEqual(rest, expected[2:])
+        pools = search.search_places(models.storage,
+                                     amenities=[self.pool.id], limit=1)
+        self.assertEqual(pools, [place for place in expected
+                                 if self.pool.id in place.amenity_ids][:1])
@@ -0,0 +1,83 @@
+#!/usr/bin/python3
+"""
+Contains the TestSerializerDocs and TestSerializer classes
+"""
+
+import inspect
+import json
+from models.engine import serializer
+import pep8
+import unittest
+
+
+class TestSerializerDocs(unittest.TestCase):
+    """Tests to check the documentation and style of serializer module"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.serializer_f = inspect.getmembers(serializer, inspect.isfunction)
+
+    def test_pep8_conformance_serializer(self):
+        """Test that models/engine/serializer.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/serializer.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_serializer(self):
+        """Test tests/test_models/test_engine/test_serializer.py PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_serializer.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_serializer_module_docstring(self):
+        """Test for the serializer.py module docstring"""
+        self.assertIsNot(serializer.__doc__, None,
+                         "serializer.py needs a docstring")
+        self.assertTrue(len(serializer.__doc__) >= 1,
+                        "serializer.py needs a docstring")
+
+    def test_serializer_func_docstrings(self):
+        """Test for the presence of docstrings in serializer functions"""
+        for func in self.serializer_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+class TestSerializer(unittest.TestCase):
+    """Test the serializer module"""
+    def test_backend(self):
+        """Test that a known backend was selected"""
+        self.assertIn(serializer.backend, ("orjson", "ujson", "json"))
+
+    def test_round_trip(self):
+        """Test that dumps and loads agree with the json module"""
+        obj = {"name": "São Paulo/Brazil", "number_rooms": 4,
+               "latitude": 37.77, "amenity_ids": ["a", "b"], "text": None}
+        string = serializer.dumps(obj)
+        self.assertIs(type(string), str)
+        self.assertEqual(json.loads(string), obj)
+        self.assertEqual(serializer.loads(string), obj)
+        self.assertEqual(serializer.loads(string.encode("utf-8")), obj)
+
+    def test_sort_keys(self):
+        """Test that dumps sorts keys when asked to"""
+        string = serializer.dumps({"b": 1, "a": 2}, sort_keys=True)
+        self.assertLess(string.index('"a"'), string.index('"b"'))
+
+    def test_fallback(self):
+        """Test that dumps handles what the fast backends refuse"""
+        self.assertEqual(json.loads(serializer.dumps({1: "one"})),
+                         {"1": "one"})
+
+    def test_iterdumps(self):
+        """Test that iterdumps chunks a JSON array"""
+        objs = [{"id": str(i)} for i in range(100)]
+        chunks = list(serializer.iterdumps(iter(objs), chunk_size=64))
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(json.loads("".join(chunks)), objs)
+        self.assertEqual(json.loads("".join(serializer.iterdumps([]))), [])
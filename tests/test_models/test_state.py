@@ -8,6 +8,7 @@ import inspect
 import models
 from models import state
 from models.base_model import BaseModel
+from models.city import City
 import pep8
 import unittest
 State = state.State
@@ -76,6 +77,19 @@ class TestState(unittest.TestCase):
         else:
             self.assertEqual(state.name, "")
 
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_cities(self):
+        """Test that cities returns the City instances of the state"""
+        state = State()
+        city = City(state_id=state.id)
+        other = City(state_id="other")
+        models.storage.new(city)
+        models.storage.new(other)
+        self.assertEqual(state.cities, [city])
+        models.storage.delete(city)
+        models.storage.delete(other)
+        self.assertEqual(state.cities, [])
+
     def test_to_dict_creates_dict(self):
         """test to_dict method creates a dictionary with proper attrs"""
         s = State()